@@ -0,0 +1,35 @@
+import gc
+import time
+import typing
+
+import pyjackson
+
+
+class Point:
+    def __init__(self, x: int, y: int, tags: typing.List[str]):
+        self.x = x
+        self.y = y
+        self.tags = tags
+
+
+class Path:
+    def __init__(self, name: str, points: typing.List[Point]):
+        self.name = name
+        self.points = points
+
+
+payload = pyjackson.dumps([Path(str(i), [Point(j, j, ['a', 'b']) for j in range(100)]) for i in range(3000)])
+
+start = time.perf_counter()
+paths = pyjackson.loads(payload, typing.List[Path])
+print('loads: {:.2f}s'.format(time.perf_counter() - start))
+del paths
+gc.collect()
+
+start = time.perf_counter()
+paths = pyjackson.loads(payload, typing.List[Path], bulk=True)  # same as inside `with pyjackson.bulk_load():`
+print('loads with bulk=True: {:.2f}s'.format(time.perf_counter() - start))
+
+# results which live until the end of the process can be moved out of GC reach
+with pyjackson.bulk_load(freeze=True):
+    config = pyjackson.loads(payload, typing.List[Path])
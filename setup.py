@@ -66,7 +66,10 @@ setup(
         # eg: 'aspectlib==1.1.1', 'six>=1.7',
     ],
     extras_require={
-        'pydantic': ['pydantic==1.4']
+        'pydantic': ['pydantic==1.4'],
+        'numpy': ['numpy'],
+        'msgpack': ['msgpack>=1.0'],
+        'zstd': ['zstandard>=0.15'],
         # eg:
         #   'rst': ['docutils>=0.11'],
         #   ':python_version=="2.6"': ['argparse'],
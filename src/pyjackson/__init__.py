@@ -1,8 +1,75 @@
-from . import builtin_types
-from .helpers import deserialize, dump, dumps, load, loads, read, serialize, write
+import sys
 
-__all__ = ['builtin_types', 'deserialize', 'dump', 'dumps', 'load', 'loads', 'read', 'serialize', 'write']
+# attributes are imported on first access (see __getattr__) to keep `import pyjackson` fast
+# attribute name -> name of submodule to import it from
+_LAZY_ATTRIBUTES = {
+    'builtin_types': None,
+    'bulk_load': 'helpers',
+    'cached_read': 'helpers',
+    'clear_read_cache': 'helpers',
+    'deserialize': 'deserialization',
+    'disable_spec_cache': 'spec_cache',
+    'dump': 'helpers',
+    'dump_lines': 'helpers',
+    'dumpb_msgpack': 'helpers',
+    'dumps': 'helpers',
+    'enable_spec_cache': 'spec_cache',
+    'load': 'helpers',
+    'load_lines': 'helpers',
+    'loadb_msgpack': 'helpers',
+    'loads': 'helpers',
+    'ndjson_offsets': 'helpers',
+    'open_file': 'helpers',
+    'prefork_warmup': 'warmup',
+    'prepare': 'warmup',
+    'read': 'helpers',
+    'read_dir': 'helpers',
+    'read_lines': 'helpers',
+    'read_sharded': 'helpers',
+    'save_spec_cache': 'spec_cache',
+    'serialize': 'serialization',
+    'write': 'helpers',
+    'write_lines': 'helpers',
+    'write_sharded': 'helpers',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
 
 __version__ = '0.0.28'
 __author__ = 'Mikhail Sveshnikov'
 __email__ = 'mike0sv@gmail.com'
+
+
+def _import_attribute(name: str):
+    from importlib import import_module
+    module_name = _LAZY_ATTRIBUTES[name]
+    if module_name is None:
+        value = import_module('.' + name, __name__)
+    else:
+        value = getattr(import_module('.' + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _import_attribute(name)
+    if not name.startswith('__'):
+        # submodules, eg pyjackson.helpers, are available as attributes after `import pyjackson`, as before
+        from importlib import import_module
+        try:
+            return import_module('.' + name, __name__)
+        except ModuleNotFoundError as e:
+            if e.name != '{}.{}'.format(__name__, name):
+                raise
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # module __getattr__ is not supported
+    for _name in _LAZY_ATTRIBUTES:
+        _import_attribute(_name)
@@ -0,0 +1,162 @@
+"""Minimal pure-python MessagePack encoder and decoder.
+Used by :func:`pyjackson.helpers.dumpb_msgpack` and :func:`pyjackson.helpers.loadb_msgpack` if msgpack is not installed.
+Supports nil, bool, int, float, str, bin, array and map formats (no extension types)"""
+import struct
+
+from pyjackson.errors import DeserializationError, SerializationError
+
+__all__ = ['packb', 'unpackb']
+
+_float64 = struct.Struct('>Bd')
+_FIXED_INT_FORMATS = [  # (max value, code, struct)
+    (0xff, 0xcc, struct.Struct('>BB')),
+    (0xffff, 0xcd, struct.Struct('>BH')),
+    (0xffffffff, 0xce, struct.Struct('>BI')),
+    (0xffffffffffffffff, 0xcf, struct.Struct('>BQ')),
+]
+_FIXED_NEGATIVE_INT_FORMATS = [  # (min value, code, struct)
+    (-0x80, 0xd0, struct.Struct('>Bb')),
+    (-0x8000, 0xd1, struct.Struct('>Bh')),
+    (-0x80000000, 0xd2, struct.Struct('>Bi')),
+    (-0x8000000000000000, 0xd3, struct.Struct('>Bq')),
+]
+_SIZE_FORMATS = [(0xff, struct.Struct('>BB')), (0xffff, struct.Struct('>BH')), (0xffffffff, struct.Struct('>BI'))]
+
+
+def _pack_size(out: bytearray, size: int, fix_code: int, fix_max: int, codes):
+    if size <= fix_max:
+        out.append(fix_code | size)
+        return
+    for (max_size, fmt), code in zip(_SIZE_FORMATS, codes):
+        if code is not None and size <= max_size:
+            out += fmt.pack(code, size)
+            return
+    raise SerializationError('Object of size {} is too large for msgpack'.format(size))
+
+
+def _pack(obj, out: bytearray):
+    if obj is None:
+        out.append(0xc0)
+    elif obj is True:
+        out.append(0xc3)
+    elif obj is False:
+        out.append(0xc2)
+    elif isinstance(obj, int):
+        if 0 <= obj <= 0x7f:
+            out.append(obj)
+        elif -32 <= obj < 0:
+            out.append(obj & 0xff)
+        elif obj > 0:
+            for max_value, code, fmt in _FIXED_INT_FORMATS:
+                if obj <= max_value:
+                    out += fmt.pack(code, obj)
+                    return
+            raise SerializationError('Integer {} is too large for msgpack'.format(obj))
+        else:
+            for min_value, code, fmt in _FIXED_NEGATIVE_INT_FORMATS:
+                if obj >= min_value:
+                    out += fmt.pack(code, obj)
+                    return
+            raise SerializationError('Integer {} is too large for msgpack'.format(obj))
+    elif isinstance(obj, float):
+        out += _float64.pack(0xcb, obj)
+    elif isinstance(obj, str):
+        data = obj.encode('utf8')
+        _pack_size(out, len(data), 0xa0, 31, (0xd9, 0xda, 0xdb))
+        out += data
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        data = memoryview(obj).cast('B') if isinstance(obj, memoryview) and obj.c_contiguous else bytes(obj)
+        _pack_size(out, len(data), 0, -1, (0xc4, 0xc5, 0xc6))
+        out += data
+    elif isinstance(obj, (list, tuple)):
+        _pack_size(out, len(obj), 0x90, 15, (None, 0xdc, 0xdd))
+        for o in obj:
+            _pack(o, out)
+    elif isinstance(obj, dict):
+        _pack_size(out, len(obj), 0x80, 15, (None, 0xde, 0xdf))
+        for key, value in obj.items():
+            _pack(key, out)
+            _pack(value, out)
+    else:
+        raise SerializationError('Cannot pack {} of type {} to msgpack'.format(obj, type(obj)))
+
+
+def packb(obj) -> bytes:
+    """Pack JSON-compatible object (with bytes allowed) to msgpack bytes"""
+    out = bytearray()
+    _pack(obj, out)
+    return bytes(out)
+
+
+# code -> struct for fixed size values
+_FIXED_VALUES = {
+    0xca: struct.Struct('>f'), 0xcb: struct.Struct('>d'),
+    0xcc: struct.Struct('>B'), 0xcd: struct.Struct('>H'), 0xce: struct.Struct('>I'), 0xcf: struct.Struct('>Q'),
+    0xd0: struct.Struct('>b'), 0xd1: struct.Struct('>h'), 0xd2: struct.Struct('>i'), 0xd3: struct.Struct('>q'),
+}
+# code -> (kind, struct for size)
+_SIZED_VALUES = {
+    0xc4: ('bin', _FIXED_VALUES[0xcc]), 0xc5: ('bin', _FIXED_VALUES[0xcd]), 0xc6: ('bin', _FIXED_VALUES[0xce]),
+    0xd9: ('str', _FIXED_VALUES[0xcc]), 0xda: ('str', _FIXED_VALUES[0xcd]), 0xdb: ('str', _FIXED_VALUES[0xce]),
+    0xdc: ('array', _FIXED_VALUES[0xcd]), 0xdd: ('array', _FIXED_VALUES[0xce]),
+    0xde: ('map', _FIXED_VALUES[0xcd]), 0xdf: ('map', _FIXED_VALUES[0xce]),
+}
+
+
+def _unpack(data: memoryview, pos: int):
+    code = data[pos]
+    pos += 1
+    if code <= 0x7f:
+        return code, pos
+    if code >= 0xe0:
+        return code - 0x100, pos
+    if 0xa0 <= code <= 0xbf:
+        kind, size = 'str', code & 0x1f
+    elif 0x90 <= code <= 0x9f:
+        kind, size = 'array', code & 0x0f
+    elif 0x80 <= code <= 0x8f:
+        kind, size = 'map', code & 0x0f
+    elif code == 0xc0:
+        return None, pos
+    elif code == 0xc2:
+        return False, pos
+    elif code == 0xc3:
+        return True, pos
+    elif code in _FIXED_VALUES:
+        fmt = _FIXED_VALUES[code]
+        return fmt.unpack_from(data, pos)[0], pos + fmt.size
+    elif code in _SIZED_VALUES:
+        kind, fmt = _SIZED_VALUES[code]
+        size = fmt.unpack_from(data, pos)[0]
+        pos += fmt.size
+    else:
+        raise DeserializationError('Unsupported msgpack type code {:#x}'.format(code))
+
+    if kind == 'str':
+        return str(data[pos:pos + size], 'utf8'), pos + size
+    elif kind == 'bin':
+        return data[pos:pos + size].tobytes(), pos + size
+    elif kind == 'array':
+        result = []
+        for _ in range(size):
+            value, pos = _unpack(data, pos)
+            result.append(value)
+        return result, pos
+    else:
+        result = {}
+        for _ in range(size):
+            key, pos = _unpack(data, pos)
+            result[key], pos = _unpack(data, pos)
+        return result, pos
+
+
+def unpackb(data) -> object:
+    """Unpack msgpack bytes to python object"""
+    data = memoryview(data).cast('B')
+    try:
+        result, pos = _unpack(data, 0)
+    except (IndexError, struct.error):
+        raise DeserializationError('Truncated msgpack data')
+    if pos != len(data):
+        raise DeserializationError('Extra data after msgpack object')
+    return result
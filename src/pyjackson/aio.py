@@ -0,0 +1,183 @@
+"""Asyncio versions of :mod:`pyjackson.helpers`.
+
+Blocking file I/O and CPU-heavy (de)serialization are run in executor, so event loop is not blocked.
+By default loop's default executor (thread pool) is used. Pass :class:`concurrent.futures.ProcessPoolExecutor`
+to run deserialization in parallel: in that case types (and serializers) must be picklable
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import AsyncIterator, Iterable, List, Type, TypeVar
+
+from pyjackson.deserialization import deserialize
+from pyjackson.generics import SerializerType
+from pyjackson.helpers import read, write
+from pyjackson.iterative import _VISIT, _deserialize_step
+from pyjackson.serialization import serialize
+
+__all__ = ['aread', 'awrite', 'aload_lines', 'adump_lines', 'adeserialize']
+
+T = TypeVar('T')
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_CHUNK_SIZE = 1 << 16
+# number of deserialization steps between clock checks in adeserialize
+_STEPS_PER_CHECK = 64
+
+
+# get_event_loop is deprecated in coroutines, get_running_loop is python 3.7+
+_get_running_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+def _run(executor, func, *args):
+    return _get_running_loop().run_in_executor(executor, func, *args)
+
+
+async def aread(path: str, as_class: Type[T], executor: Executor = None) -> T:
+    """
+    Asynchronously deserialize object from file in `path` as as_class. See :func:`pyjackson.helpers.read`
+
+    :param path: path to file with JSON representation
+    :param as_class: type or serializer
+    :param executor: executor to read and deserialize in, loop's default executor by default
+    :return: deserialized instance of as_class (or real_type of serializer)
+    """
+    return await _run(executor, read, path, as_class)
+
+
+async def awrite(path: str, obj, as_class: type = None, executor: Executor = None):
+    """
+    Asynchronously serialize `obj` to JSON and write it to `path`. See :func:`pyjackson.helpers.write`
+
+    :param path: path to write JSON representation
+    :param obj: object to serialize
+    :param as_class: type or serializer
+    :param executor: executor to serialize and write in, loop's default executor by default
+    :return: bytes written
+    """
+    return await _run(executor, write, path, obj, as_class)
+
+
+def _loads_lines(lines: List[bytes], as_class) -> list:
+    return [deserialize(json.loads(line), as_class) for line in lines]
+
+
+def _dumps_lines(objs: list, as_class) -> bytes:
+    return ''.join([json.dumps(serialize(o, as_class)) + '\n' for o in objs]).encode('utf8')
+
+
+async def _read_batches(reader: asyncio.StreamReader, batch_size: int, chunk_size: int) -> AsyncIterator[List[bytes]]:
+    """Batches of non-empty lines of stream. Stream is read in chunks instead of :meth:`~asyncio.StreamReader.readline`,
+    so length of lines is not limited by reader's limit"""
+    batch = []
+    partial = []  # parts of line which is not terminated yet
+    while True:
+        chunk = await reader.read(chunk_size)
+        if not chunk:
+            if partial:
+                batch.append(b''.join(partial))
+            batch = [line for line in batch if line.strip()]
+            for i in range(0, len(batch), batch_size):
+                yield batch[i:i + batch_size]
+            return
+        lines = chunk.split(b'\n')
+        if len(lines) == 1:
+            partial.append(chunk)
+            continue
+        partial.append(lines[0])
+        lines[0] = b''.join(partial)
+        partial = [lines.pop()]
+        batch.extend(line for line in lines if line.strip())
+        full = len(batch) - len(batch) % batch_size
+        for i in range(0, full, batch_size):
+            yield batch[i:i + batch_size]
+        batch = batch[full:]
+
+
+async def aload_lines(reader: asyncio.StreamReader, as_class: Type[T], executor: Executor = None,
+                      batch_size: int = DEFAULT_BATCH_SIZE, prefetch: int = 2,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[T]:
+    """
+    Asynchronously deserialize NDJSON records from stream. Records are deserialized in executor in batches,
+    next batches are read from stream while previous ones are being deserialized.
+    Size of records is not limited by `limit` of `reader`
+
+    :param reader: stream to read
+    :param as_class: type or serializer for each record
+    :param executor: executor to deserialize in, loop's default executor by default
+    :param batch_size: number of records to deserialize in one executor call
+    :param prefetch: max number of batches being deserialized at the same time.
+        Set it to number of workers for process pool
+    :param chunk_size: number of bytes to read from stream at once
+    :return: async iterator over instances of as_class
+    """
+    pending = deque()
+    batches = _read_batches(reader, batch_size, chunk_size)
+    while True:
+        try:
+            batch = await batches.__anext__()
+        except StopAsyncIteration:
+            batch = None
+        if batch:
+            pending.append(_run(executor, _loads_lines, batch, as_class))
+        if pending and (len(pending) >= prefetch or not batch):
+            for obj in await pending.popleft():
+                yield obj
+        if not batch and not pending:
+            return
+
+
+async def adump_lines(writer: asyncio.StreamWriter, objs: Iterable, as_class: type = None, executor: Executor = None,
+                      batch_size: int = DEFAULT_BATCH_SIZE):
+    """
+    Asynchronously serialize objs as NDJSON and write them to stream. Objects are serialized in executor in batches,
+    writer is drained after each batch
+
+    :param writer: stream to write
+    :param objs: objects to serialize
+    :param as_class: type or serializer for each object
+    :param executor: executor to serialize in, loop's default executor by default
+    :param batch_size: number of objects to serialize in one executor call
+    :return: bytes written
+    """
+    written = 0
+    objs = iter(objs)
+    while True:
+        batch = [o for _, o in zip(range(batch_size), objs)]
+        if not batch:
+            return written
+        data = await _run(executor, _dumps_lines, batch, as_class)
+        writer.write(data)
+        written += len(data)
+        await writer.drain()
+
+
+async def adeserialize(obj, as_class: SerializerType, budget_ms: float = 5):
+    """
+    Deserialize object in event loop thread, yielding control to event loop every `budget_ms` milliseconds.
+    Result is the same as for :func:`pyjackson.deserialize`. Payload is processed incrementally
+    with :func:`pyjackson.iterative.deserialize` machinery, so event loop is never blocked for much longer
+    than `budget_ms` (single custom serializer call can not be interrupted though)
+
+    :param obj: dict (or list or any primitive) to deserialize
+    :param as_class: type or serializer
+    :param budget_ms: max time of uninterrupted work in milliseconds
+    :return: deserialized instance of as_class (or real_type of serializer)
+    :raise: DeserializationError
+    """
+    root = [None]
+    stack = [(_VISIT, obj, as_class, root, 0)]
+    budget = budget_ms / 1000
+    clock = time.perf_counter
+    deadline = clock() + budget
+    while stack:
+        for _ in range(_STEPS_PER_CHECK):
+            _deserialize_step(stack)
+            if not stack:
+                break
+        if clock() >= deadline:
+            await asyncio.sleep(0)
+            deadline = clock() + budget
+    return root[0]
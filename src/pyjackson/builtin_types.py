@@ -1,9 +1,22 @@
+import array
+import binascii
 import builtins
 import datetime
+import decimal
+import sys
+import threading
 import uuid
+from contextlib import contextmanager
+from enum import Enum
+from functools import lru_cache
 
-from pyjackson.generics import StaticSerializer
-from pyjackson.serialization import SerializationError
+from pyjackson.core import FIELD_MAPPING_NAME_FIELD, SCALAR_TYPES, Position
+from pyjackson.deserialization import deserialize
+from pyjackson.errors import DeserializationError
+from pyjackson.generics import SERIALIZER_MAPPING, Serializer, StaticSerializer, _register_subtypes_serializer
+from pyjackson.serialization import SerializationError, serialize
+from pyjackson.utils import (get_class_fields, get_class_fields_getter, get_type_field_name, resolve_subtype,
+                             type_field_position_is)
 
 
 class PrimitiveTypeSerializer(StaticSerializer):
@@ -35,6 +48,144 @@ class UuidSerializer(StaticSerializer):
         return str(instance)
 
 
+_binary_payloads = threading.local()
+
+
+@contextmanager
+def binary_payloads():
+    """Context manager in which binary values are serialized as is instead of base64 strings.
+    Used for binary formats which support bytes natively, like msgpack"""
+    previous = getattr(_binary_payloads, 'enabled', False)
+    _binary_payloads.enabled = True
+    try:
+        yield
+    finally:
+        _binary_payloads.enabled = previous
+
+
+def encode_binary(buffer):
+    """Serialize bytes-like object: base64 string (without intermediate copies) or
+    buffer itself inside :func:`binary_payloads`"""
+    if isinstance(buffer, memoryview) and not buffer.c_contiguous:
+        buffer = buffer.tobytes()
+    if getattr(_binary_payloads, 'enabled', False):
+        return buffer if isinstance(buffer, (bytes, bytearray)) else memoryview(buffer).cast('B')
+    return binascii.b2a_base64(buffer, newline=False).decode('ascii')
+
+
+def decode_binary(obj):
+    """Deserialize bytes-like object from base64 string or bytes-like payload.
+    Bytes-like payloads are returned as is"""
+    if isinstance(obj, str):
+        return binascii.a2b_base64(obj)
+    return obj
+
+
+class BytesSerializer(StaticSerializer):
+    """:class:`~pyjackson.generics.StaticSerializer` for :class:`bytes` type as base64 string"""
+    real_type = bytes
+
+    @classmethod
+    def deserialize(cls, obj: str):
+        obj = decode_binary(obj)
+        return obj if type(obj) is bytes else bytes(obj)
+
+    @classmethod
+    def serialize(cls, instance: bytes):
+        return encode_binary(instance)
+
+
+class BytearraySerializer(StaticSerializer):
+    """:class:`~pyjackson.generics.StaticSerializer` for :class:`bytearray` type as base64 string"""
+    real_type = bytearray
+
+    @classmethod
+    def deserialize(cls, obj: str):
+        return bytearray(decode_binary(obj))
+
+    @classmethod
+    def serialize(cls, instance: bytearray):
+        return encode_binary(instance)
+
+
+class MemoryviewSerializer(StaticSerializer):
+    """:class:`~pyjackson.generics.StaticSerializer` for :class:`memoryview` type as base64 string.
+    Use `memoryview` as type hint for large binary fields: decoded value is a read-only view
+    over decoded buffer, so it is not copied again"""
+    real_type = memoryview
+
+    @classmethod
+    def deserialize(cls, obj: str):
+        return memoryview(decode_binary(obj))
+
+    @classmethod
+    def serialize(cls, instance: memoryview):
+        return encode_binary(instance)
+
+
+# caches are bounded: offsets come from payloads and may be arbitrary
+@lru_cache(maxsize=256)
+def _iso_utc_offset(value: str) -> str:
+    """Convert utc offset from %z format to ISO-8601 format, eg +0300 to +03:00"""
+    offset = datetime.datetime.strptime(value, '%z').utcoffset()
+    return datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone(offset)).isoformat()[19:]
+
+
+@lru_cache(maxsize=256)
+def _utc_offset_formats(offset: datetime.timedelta):
+    """Utc offset in ISO-8601 and %z formats"""
+    value = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone(offset))
+    return value.isoformat()[19:], value.strftime('%z')
+
+
+def _parse_iso_date(value: str) -> datetime.date:
+    """:meth:`datetime.date.fromisoformat` for python < 3.7"""
+    return datetime.datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _parse_iso_time(value: str) -> datetime.time:
+    """:meth:`datetime.time.fromisoformat` for python < 3.7"""
+    tzinfo = None
+    for sign in '+-':
+        if sign in value:
+            value, offset = value.split(sign)
+            parts = offset.split(':')
+            delta = datetime.timedelta(hours=int(parts[0]), minutes=int(parts[1]),
+                                       seconds=float(parts[2]) if len(parts) > 2 else 0)
+            tzinfo = datetime.timezone(delta if sign == '+' else -delta)
+            break
+    time_format = ['%H', '%H:%M', '%H:%M:%S'][value.count(':')] + ('.%f' if '.' in value else '')
+    return datetime.datetime.strptime(value, time_format).time().replace(tzinfo=tzinfo)
+
+
+def _parse_iso_datetime(value: str) -> datetime.datetime:
+    """:meth:`datetime.datetime.fromisoformat` for python < 3.7"""
+    date = _parse_iso_date(value[:10])
+    time = _parse_iso_time(value[11:]) if len(value) > 10 else datetime.time()
+    return datetime.datetime.combine(date, time)
+
+
+_date_fromisoformat = getattr(datetime.date, 'fromisoformat', _parse_iso_date)
+_time_fromisoformat = getattr(datetime.time, 'fromisoformat', _parse_iso_time)
+_datetime_fromisoformat = getattr(datetime.datetime, 'fromisoformat', _parse_iso_datetime)
+
+
+class IsoDatetimeSerializer(StaticSerializer):
+    """:class:`~pyjackson.generics.StaticSerializer` for :class:`datetime.datetime` type in ISO-8601 format.
+    Not used by default, use it as type hint instead of :class:`datetime.datetime`
+    or make it default with `real_types(datetime.datetime)(IsoDatetimeSerializer)`"""
+    real_type = datetime.datetime
+
+    @classmethod
+    def deserialize(cls, obj: str):
+        return _datetime_fromisoformat(obj)
+
+    @classmethod
+    def serialize(cls, instance: datetime.datetime):
+        return instance.isoformat()
+
+
+# declared after IsoDatetimeSerializer to be registered as default serializer for datetime.datetime
 class DatetimeSerializer(StaticSerializer):
     """:class:`~pyjackson.generics.StaticSerializer` for :class:`datetime.datetime` type"""
     real_type = datetime.datetime
@@ -42,7 +193,13 @@ class DatetimeSerializer(StaticSerializer):
 
     @classmethod
     def deserialize(cls, obj: str):
-        tz = obj.split(' ')[-1]
+        value, _, tz = obj.rpartition(' ')
+        try:
+            # same as strptime with DT_FORMAT, but much faster
+            return datetime.datetime.fromisoformat(value + _iso_utc_offset(tz) if tz != '' else value)
+        except (ValueError, AttributeError):
+            # not in canonical format, or python < 3.7
+            pass
         if tz != '':
             return datetime.datetime.strptime(obj, cls.DT_FORMAT)
         else:
@@ -50,4 +207,253 @@ class DatetimeSerializer(StaticSerializer):
 
     @classmethod
     def serialize(cls, instance: datetime.datetime):
-        return instance.strftime(cls.DT_FORMAT)
+        if instance.year < 1000:
+            # strftime does not pad years with zeros
+            return instance.strftime(cls.DT_FORMAT)
+        value = instance.isoformat(' ', 'microseconds')
+        offset = instance.utcoffset()
+        if offset is None:
+            return value + ' '
+        iso_offset, offset = _utc_offset_formats(offset)
+        return value[:-len(iso_offset)] + ' ' + offset
+
+
+class DateSerializer(StaticSerializer):
+    """:class:`~pyjackson.generics.StaticSerializer` for :class:`datetime.date` type in ISO-8601 format"""
+    real_type = datetime.date
+
+    @classmethod
+    def deserialize(cls, obj: str):
+        return _date_fromisoformat(obj)
+
+    @classmethod
+    def serialize(cls, instance: datetime.date):
+        return instance.isoformat()
+
+
+class TimeSerializer(StaticSerializer):
+    """:class:`~pyjackson.generics.StaticSerializer` for :class:`datetime.time` type in ISO-8601 format"""
+    real_type = datetime.time
+
+    @classmethod
+    def deserialize(cls, obj: str):
+        return _time_fromisoformat(obj)
+
+    @classmethod
+    def serialize(cls, instance: datetime.time):
+        return instance.isoformat()
+
+
+class TimedeltaSerializer(StaticSerializer):
+    """:class:`~pyjackson.generics.StaticSerializer` for :class:`datetime.timedelta` type as number of seconds"""
+    real_type = datetime.timedelta
+
+    @classmethod
+    def deserialize(cls, obj: float):
+        return datetime.timedelta(seconds=obj)
+
+    @classmethod
+    def serialize(cls, instance: datetime.timedelta):
+        return instance.total_seconds()
+
+
+class DecimalSerializer(StaticSerializer):
+    """:class:`~pyjackson.generics.StaticSerializer` for :class:`decimal.Decimal` type as string"""
+    real_type = decimal.Decimal
+
+    @classmethod
+    def deserialize(cls, obj: str):
+        return decimal.Decimal(obj)
+
+    @classmethod
+    def serialize(cls, instance: decimal.Decimal):
+        return str(instance)
+
+
+class EnumSerializer(Serializer):
+    """:class:`~pyjackson.generics.Serializer` for :class:`enum.Enum` subclasses.
+    Used by default for all enums (serialized by value). Use `EnumSerializer(MyEnum, by_name=True)`
+    as type hint to serialize by member name
+
+    :param enum_type: enum class
+    :param by_name: serialize member name instead of value
+    """
+
+    def __init__(self, enum_type: type, by_name: bool = False):
+        self.enum_type = enum_type
+        self.by_name = by_name
+        if by_name:
+            self._to_member = dict(enum_type.__members__)
+            self._to_payload = {m: m.name for m in enum_type}
+        else:
+            self._to_member = {}
+            for m in enum_type:
+                try:
+                    self._to_member[m.value] = m
+                except TypeError:
+                    pass  # unhashable value, will be resolved by enum_type(value)
+            self._to_payload = {m: m.value for m in enum_type}
+
+    def deserialize(self, obj):
+        try:
+            return self._to_member[obj]
+        except (KeyError, TypeError):
+            pass
+        if self.by_name:
+            raise DeserializationError('{} is not a member of {}'.format(obj, self.enum_type))
+        return self.enum_type(obj)
+
+    def serialize(self, instance: Enum):
+        try:
+            return self._to_payload[instance]
+        except KeyError:
+            # composite flags are not members
+            return instance.name if self.by_name else instance.value
+
+
+_register_subtypes_serializer(EnumSerializer, Enum)
+
+
+class ArraySerializer(Serializer):
+    """:class:`~pyjackson.generics.Serializer` for :class:`array.array` type.
+    Use it as type hint instead of `List[int]` or `List[float]` to store numbers compactly:
+    `ArraySerializer('d')` is serialized to the same list of numbers, but deserialized to `array.array('d', ...)`.
+    With `packed=True` array is serialized as base64 of its little-endian buffer.
+    Both list and packed payloads are accepted for deserialization
+
+    :param typecode: :mod:`array` typecode
+    :param packed: serialize as base64 string instead of list
+    """
+    # no real_type: this serializer and its parametrizations must not be registered as default for array.array
+
+    def __init__(self, typecode: str, packed: bool = False):
+        self.typecode = typecode
+        self.packed = packed
+
+    def deserialize(self, obj):
+        try:
+            if isinstance(obj, list):
+                return array.array(self.typecode, obj)
+            result = array.array(self.typecode)
+            result.frombytes(decode_binary(obj))
+        except (ValueError, TypeError, OverflowError) as e:
+            raise DeserializationError('Can\'t deserialize array of typecode {!r}: {}'.format(self.typecode, e))
+        if sys.byteorder == 'big':
+            result.byteswap()
+        return result
+
+    def serialize(self, instance):
+        if not isinstance(instance, array.array) or instance.typecode != self.typecode:
+            instance = array.array(self.typecode, instance)
+        if not self.packed:
+            return instance.tolist()
+        if sys.byteorder == 'big':
+            instance = array.array(self.typecode, instance)
+            instance.byteswap()
+        return encode_binary(instance)
+
+
+class TypecodeArraySerializer(StaticSerializer):
+    """:class:`~pyjackson.generics.StaticSerializer` for :class:`array.array` type.
+    Used by default for arrays without :class:`ArraySerializer` type hint,
+    serializes array as `{'typecode': ..., 'items': [...]}`"""
+    real_type = array.array
+
+    @classmethod
+    def deserialize(cls, obj: dict):
+        try:
+            return array.array(obj['typecode'], obj['items'])
+        except (KeyError, ValueError, TypeError, OverflowError) as e:
+            raise DeserializationError('Can\'t deserialize array from {!r}: {}'.format(obj, e))
+
+    @classmethod
+    def serialize(cls, instance: array.array):
+        return {'typecode': instance.typecode, 'items': instance.tolist()}
+
+
+class ColumnarSerializer(Serializer):
+    """:class:`~pyjackson.generics.Serializer` for lists of records in columnar (struct-of-arrays) format.
+    Use `ColumnarSerializer(Record)` as type hint instead of `List[Record]`: list is serialized as
+    `{field: [values...]}` with column for each field of `Record` instead of list of dicts.
+    All items must be exactly of type `Record`, which must have at least one field. Missing values are stored as `None`.
+    Subtypes of fields with :attr:`~pyjackson.core.Position.OUTSIDE` type field are resolved by type field column.
+    Plain list of records is also accepted for deserialization
+
+    :param item_type: type of list items
+    """
+    real_type = list
+
+    def __init__(self, item_type: type):
+        self.item_type = item_type
+        # computed on first use, so that item_type may have forward references to not yet declared types
+        self._plan = None
+
+    def _get_plan(self, error: type):
+        """List of (field, payload key, whether values are plain scalars which are serialized as is)"""
+        if self._plan is None:
+            fields = get_class_fields(self.item_type)
+            if len(fields) == 0:
+                # columns of type without fields can not store number of items
+                raise error('Cannot use {} without fields as columnar item type'.format(self.item_type))
+            mapping = getattr(self.item_type, FIELD_MAPPING_NAME_FIELD, None) or {}
+            self._plan = [(f, mapping.get(f.name, f.name), f.type in SCALAR_TYPES and f.type not in SERIALIZER_MAPPING)
+                          for f in fields]
+        return self._plan
+
+    def serialize(self, instance: list):
+        plan = self._get_plan(SerializationError)
+        for item in instance:
+            if type(item) is not self.item_type:
+                raise SerializationError('Cannot serialize {} as column of {}'.format(item, self.item_type))
+        columns = zip(*map(get_class_fields_getter(self.item_type), instance)) if instance else [()] * len(plan)
+        return {key: self._serialize_column(list(values), f.type, scalar)
+                for (f, key, scalar), values in zip(plan, columns)}
+
+    @staticmethod
+    def _serialize_column(values: list, field_type, scalar: bool):
+        if scalar and all(type(v) is field_type or v is None for v in values):
+            return values
+        return [None if v is None else serialize(v, field_type) for v in values]
+
+    @staticmethod
+    def _deserialize_outside_hierarchy_column(values: list, field_type, obj: dict):
+        # subtypes are resolved by values of type field, which is a sibling column
+        type_field_name = get_type_field_name(field_type)
+        if type_field_name not in obj:
+            raise DeserializationError('Can\'t find type column named "{}" for {}'.format(type_field_name, field_type))
+        return [None if v is None else deserialize(v, resolve_subtype(field_type, {type_field_name: alias}))
+                for v, alias in zip(values, obj[type_field_name])]
+
+    def deserialize(self, obj: dict):
+        if isinstance(obj, list):
+            # list of records
+            return [deserialize(o, self.item_type) for o in obj]
+        names = []
+        columns = []
+        with_defaults = []
+        for f, key, scalar in self._get_plan(DeserializationError):
+            if key not in obj:
+                if f.has_default:
+                    continue
+                raise DeserializationError('Type {} has required argument {}'.format(self.item_type, key))
+            values = obj[key]
+            if columns and len(values) != len(columns[0]):
+                raise DeserializationError(
+                    'Column {} has {} values instead of {}'.format(key, len(values), len(columns[0])))
+            if type_field_position_is(f.type, Position.OUTSIDE):
+                values = self._deserialize_outside_hierarchy_column(values, f.type, obj)
+            elif not (scalar and all(type(v) is f.type for v in values)):
+                values = [None if v is None else deserialize(v, f.type) for v in values]
+            if f.has_default:
+                with_defaults.append(len(names))
+            names.append(f.name)
+            columns.append(values)
+
+        item_type = self.item_type
+        rows = zip(*columns)
+        if not any(v is None for i in with_defaults for v in columns[i]):
+            return [item_type(**dict(zip(names, row))) for row in rows]
+        # None is a missing value, so default is used instead, like in dict format
+        skip_none = [i in with_defaults for i in range(len(names))]
+        return [item_type(**{n: v for n, v, skip in zip(names, row, skip_none) if v is not None or not skip})
+                for row in rows]
@@ -0,0 +1,350 @@
+"""Ahead-of-time generation of codecs for serializable classes.
+
+Introspection of classes (even with :mod:`pyjackson.spec_cache`) may be too slow for short-living processes.
+This module generates python module with plain encode and decode functions for all serializable classes
+and `type_field` hierarchies of given modules::
+
+    python -m pyjackson.compile mypackage.models -o mypackage/models_codecs.py
+
+Generated module registers its codecs and class fields on import, so after `import mypackage.models_codecs`
+(or `pyjackson.compile.load_codecs('mypackage.models_codecs')`, which does nothing if module does not exist)
+classes are (de)serialized without any `inspect` or `typing` introspection. Codecs are not registered
+(with a warning) if source of any of compiled modules (or modules of base classes) has changed
+since codecs were generated.
+
+Classes are skipped if they have custom serializers, are named tuples, are not importable by name or have fields
+of types that can not be written as python expressions
+"""
+import builtins
+import importlib
+import inspect
+import math
+import sys
+import typing
+import warnings
+from types import ModuleType
+
+from pyjackson.core import CLASS_SPECS_CACHE, FIELD_MAPPING_NAME_FIELD, GENERATED_CODECS, SCALAR_TYPES, Field, Position
+from pyjackson.errors import PyjacksonError
+from pyjackson.generics import SERIALIZER_MAPPING, Serializer
+from pyjackson.spec_cache import _mro_modules, _source_hash
+from pyjackson.utils import (_has_dataclass_init, get_class_fields, get_type_field_name, has_hierarchy, has_serializer,
+                             is_aslist, is_generic, is_namedtuple, is_union, issubclass_safe, type_field_position_is)
+
+__all__ = ['generate_codecs', 'register_codecs', 'load_codecs', 'main']
+
+_LITERAL_TYPES = (type(None), bool, int, float, str, bytes)
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _init_default(cls, name: str):
+    """Default value of `__init__` argument `name` of cls. Used by generated modules for non-literal defaults"""
+    return inspect.signature(cls.__init__).parameters[name].default
+
+
+def _is_literal(value) -> bool:
+    if isinstance(value, float):
+        return math.isfinite(value)
+    return type(value) in _LITERAL_TYPES
+
+
+def _resolve_qualname(module_name: str, qualname: str):
+    obj = sys.modules.get(module_name)
+    for part in qualname.split('.'):
+        obj = getattr(obj, part, None)
+    return obj
+
+
+class _Generator:
+    def __init__(self):
+        self.modules = {}  # module name -> alias
+        self.types = {}  # type expression -> constant name
+        self.lines = []
+        self.codecs = []  # (class expression, encoder name, decoder name)
+        self.fields = []  # (class expression, list of field expressions)
+        self.skipped = []  # (class, reason)
+        self.sources = set()
+
+    def class_expr(self, cls) -> str:
+        qualname = getattr(cls, '__qualname__', '')
+        if '<locals>' in qualname or _resolve_qualname(cls.__module__, qualname) is not cls:
+            raise _Unsupported('{} is not importable by name'.format(cls))
+        if cls.__module__ == 'builtins':
+            return qualname
+        alias = self.modules.setdefault(cls.__module__, '_m{}'.format(len(self.modules)))
+        return '{}.{}'.format(alias, qualname)
+
+    def value_expr(self, value) -> str:
+        if _is_literal(value):
+            return repr(value)
+        if isinstance(value, (tuple, list)):
+            items = ''.join(self.value_expr(v) + ', ' for v in value)
+            return '({})'.format(items) if isinstance(value, tuple) else '[{}]'.format(items)
+        return self.type_expr(value)
+
+    def type_expr(self, tp) -> str:
+        if tp is type(None):
+            return 'type(None)'
+        if tp is typing.Any:
+            return 'typing.Any'
+        if tp is ...:
+            return '...'
+        if is_union(tp) or is_generic(tp):
+            name = 'Union' if is_union(tp) else getattr(tp, '_name', None)
+            if name is not None and hasattr(typing, name):
+                origin = 'typing.' + name
+            elif isinstance(getattr(tp, '__origin__', None), type) and getattr(builtins, tp.__origin__.__name__,
+                                                                               None) is tp.__origin__:
+                origin = tp.__origin__.__name__  # builtin generic like list[int]
+            else:
+                raise _Unsupported('Cannot write generic {}'.format(tp))
+            return '{}[{}]'.format(origin, ', '.join(self.type_expr(a) for a in tp.__args__))
+        if issubclass_safe(tp, Serializer) and tp._is_dynamic:
+            args = ', '.join('{}={}'.format(name, self.value_expr(getattr(tp, name))) for name in tp._fields)
+            return '{}({})'.format(self.class_expr(tp._class), args)
+        if isinstance(tp, type):
+            return self.class_expr(tp)
+        raise _Unsupported('Cannot write type {}'.format(tp))
+
+    def type_const(self, tp) -> str:
+        """Name of module constant with type or plain name for builtin types"""
+        expr = self.type_expr(tp)
+        if expr.isidentifier():
+            return expr
+        return self.types.setdefault(expr, '_t{}'.format(len(self.types)))
+
+    def field_expr(self, cls, cls_expr: str, f: Field) -> str:
+        if not f.has_default or _is_literal(f.default):
+            default = repr(f.default)
+        elif _has_dataclass_init(cls):
+            default = '{}.__dataclass_fields__[{!r}].default'.format(cls_expr, f.name)
+        else:
+            if _init_default(cls, f.name) is not f.default:
+                raise _Unsupported('Cannot find default of field {}'.format(f.name))
+            default = '_init_default({}, {!r})'.format(cls_expr, f.name)
+        return 'Field({!r}, {}, {}, {})'.format(f.name, self.type_const(f.type), f.has_default, default)
+
+    def serialize_expr(self, f: Field) -> str:
+        if f.type in SCALAR_TYPES and f.type not in SERIALIZER_MAPPING:
+            return 'v if type(v) is {0} else _serialize(v, {0})'.format(f.type.__name__)
+        return '_serialize(v, {})'.format(self.type_const(f.type))
+
+    def deserialize_expr(self, f: Field, type_var: str = None) -> str:
+        if type_var is not None:
+            return '_deserialize(v, {})'.format(type_var)
+        if f.type in SCALAR_TYPES:
+            return 'v if type(v) is {0} else _deserialize(v, {0})'.format(f.type.__name__)
+        return '_deserialize(v, {})'.format(self.type_const(f.type))
+
+    def outside_types(self, fields, lines):
+        """Resolve types of fields with type in parent object, returns field name -> variable name"""
+        type_vars = {}
+        for i, f in enumerate(fields):
+            if type_field_position_is(f.type, Position.OUTSIDE):
+                type_vars[f.name] = 't{}'.format(i)
+                lines.append('    t{} = _resolve_subtype({}, data)'.format(i, self.type_const(f.type)))
+        return type_vars
+
+    def encoder(self, cls, cls_expr: str, fields, name: str):
+        lines = ['def {}(obj):'.format(name)]
+        mapping = getattr(cls, FIELD_MAPPING_NAME_FIELD, None) or {}
+        inside = type_field_position_is(cls, Position.INSIDE)
+        if is_aslist(cls):
+            lines.append('    result = []')
+            for f in fields:
+                lines += ['    v = obj.{}'.format(f.name),
+                          '    if v is not None:',
+                          '        result.append(_serialize(v))']
+            if inside:
+                lines.append('    result.insert(0, {})'.format(self.value_expr(getattr(cls, get_type_field_name(cls)))))
+        else:
+            lines.append('    result = {}')
+            for f in fields:
+                lines += ['    v = obj.{}'.format(f.name),
+                          '    if v is not None:',
+                          '        result[{!r}] = {}'.format(mapping.get(f.name, f.name), self.serialize_expr(f))]
+            if inside:
+                type_field_name = get_type_field_name(cls)
+                if any(mapping.get(f.name, f.name) == type_field_name for f in fields):
+                    lines += ['    if {!r} in result:'.format(type_field_name),
+                              '        raise _SerializationError(\'Type field name {{}} conflicts with field name in {{}}\''
+                              '.format({!r}, {}))'.format(type_field_name, cls_expr)]
+                alias = self.value_expr(getattr(cls, type_field_name))
+                lines.append('    result[{!r}] = {}'.format(type_field_name, alias))
+        lines.append('    return result')
+        return lines
+
+    def decoder(self, cls, cls_expr: str, fields, name: str):
+        lines = ['def {}(data):'.format(name)]
+        if is_aslist(cls):
+            if type_field_position_is(cls, Position.INSIDE):
+                lines.append('    data = data[1:]')
+            lines += ['    n = len(data)', '    args = []']
+            type_vars = self.outside_types(fields, lines)
+            for i, f in enumerate(fields):
+                lines += ['    if n > {}:'.format(i),
+                          '        v = data[{}]'.format(i),
+                          '        args.append({})'.format(self.deserialize_expr(f, type_vars.get(f.name)))]
+                if not f.has_default:
+                    lines += ['    else:',
+                              '        raise ValueError(\'Too few arguments for type  {{}} \'.format({}))'.format(
+                                  cls_expr)]
+            lines.append('    return {}(*args)'.format(cls_expr))
+        else:
+            mapping = getattr(cls, FIELD_MAPPING_NAME_FIELD, None) or {}
+            lines.append('    kwargs = {}')
+            type_vars = self.outside_types(fields, lines)
+            for f in fields:
+                key = mapping.get(f.name, f.name)
+                lines += ['    if {!r} in data:'.format(key),
+                          '        v = data[{!r}]'.format(key),
+                          '        kwargs[{!r}] = {}'.format(f.name, self.deserialize_expr(f, type_vars.get(f.name)))]
+                if not f.has_default:
+                    lines += ['    else:',
+                              '        raise ValueError(\'Type {{}} has required argument {{}}\'.format({}, {!r}))'
+                              .format(cls_expr, key)]
+            lines.append('    return {}(**kwargs)'.format(cls_expr))
+        return lines
+
+    def add_class(self, cls):
+        if issubclass_safe(cls, Serializer) or has_serializer(cls):
+            raise _Unsupported('has serializer')
+        if is_namedtuple(cls):
+            raise _Unsupported('named tuples are not supported')
+        try:
+            fields = get_class_fields(cls)
+        except (PyjacksonError, TypeError) as e:
+            raise _Unsupported(str(e))
+        # generate everything before adding anything, so unsupported class leaves no traces
+        state = dict(self.modules), dict(self.types)
+        try:
+            cls_expr = self.class_expr(cls)
+            index = len(self.codecs)
+            field_exprs = [self.field_expr(cls, cls_expr, f) for f in fields]
+            encoder = self.encoder(cls, cls_expr, fields, '_encode_{}'.format(index))
+            decoder = self.decoder(cls, cls_expr, fields, '_decode_{}'.format(index))
+        except _Unsupported:
+            self.modules, self.types = state
+            raise
+        self.lines += ['', '', '# {}.{}'.format(cls.__module__, cls.__qualname__)] + encoder + ['', ''] + decoder
+        self.codecs.append((cls_expr, '_encode_{}'.format(index), '_decode_{}'.format(index)))
+        self.fields.append((cls_expr, field_exprs))
+        # fields and codecs depend on base classes too
+        self.sources.update(_mro_modules(cls))
+
+    def render(self, module_names) -> str:
+        out = ['"""Codecs generated by `python -m pyjackson.compile {}`. Do not edit"""'.format(' '.join(module_names)),
+               'import typing  # noqa: F401', '']
+        out += ['import {} as {}'.format(name, alias) for name, alias in sorted(self.modules.items())]
+        out += ['from pyjackson.compile import _init_default, register_codecs  # noqa: F401',
+                'from pyjackson.core import Field',
+                'from pyjackson.deserialization import deserialize as _deserialize',
+                'from pyjackson.errors import SerializationError as _SerializationError  # noqa: F401',
+                'from pyjackson.serialization import serialize as _serialize',
+                'from pyjackson.utils import resolve_subtype as _resolve_subtype  # noqa: F401',
+                '']
+        for cls, reason in self.skipped:
+            out.append('# skipped {}.{}: {}'.format(cls.__module__, cls.__qualname__, reason))
+        out += ['{} = {}'.format(name, expr) for expr, name in self.types.items()]
+        out += self.lines
+        out += ['', '', 'SOURCES = {']
+        out += ['    {!r}: {!r},'.format(name, _source_hash(name)) for name in sorted(self.sources)]
+        out += ['}', 'FIELDS = {']
+        for cls_expr, field_exprs in self.fields:
+            out.append('    {}: ['.format(cls_expr))
+            out += ['        {},'.format(e) for e in field_exprs]
+            out.append('    ],')
+        out += ['}', 'CODECS = {']
+        out += ['    {}: ({}, {}),'.format(*codec) for codec in self.codecs]
+        out += ['}', '', 'register_codecs(SOURCES, FIELDS, CODECS)', '']
+        return '\n'.join(out)
+
+
+def _module_classes(module: ModuleType) -> list:
+    classes = [obj for name, obj in vars(module).items()
+               if isinstance(obj, type) and obj.__module__ == module.__name__ and obj.__qualname__ == name]
+    for cls in list(classes):
+        if has_hierarchy(cls):
+            classes += [t for t in cls._subtypes.values() if issubclass_safe(t, cls)]
+    return list(dict.fromkeys(classes))
+
+
+def generate_codecs(*modules: typing.Union[str, ModuleType]) -> str:
+    """
+    Generate source of module with codecs for serializable classes defined in `modules`
+    and for all registered subtypes of their `type_field` hierarchies
+
+    :param modules: modules or their names
+    :return: python source
+    """
+    modules = [importlib.import_module(m) if isinstance(m, str) else m for m in modules]
+    generator = _Generator()
+    for module in modules:
+        for cls in _module_classes(module):
+            try:
+                generator.add_class(cls)
+            except _Unsupported as e:
+                generator.skipped.append((cls, e))
+    return generator.render([m.__name__ for m in modules])
+
+
+def register_codecs(sources: typing.Dict[str, str], fields: typing.Dict[type, typing.List[Field]],
+                    codecs: typing.Dict[type, typing.Tuple[typing.Callable, typing.Callable]]) -> bool:
+    """
+    Register generated codecs and class fields. Called by generated module on import
+
+    :param sources: module name -> hash of its source at generation time, for modules of compiled classes
+        and of their base classes
+    :param fields: class -> its fields
+    :param codecs: class -> (encode function, decode function)
+    :return: False (with warning) if sources have changed and nothing was registered
+    """
+    for name, source_hash in sources.items():
+        current = _source_hash(name)
+        if current is not None and current != source_hash:
+            warnings.warn('Source of {} has changed since codecs were generated, '
+                          'regenerate them with `python -m pyjackson.compile`'.format(name))
+            return False
+    CLASS_SPECS_CACHE.update(fields)
+    GENERATED_CODECS.update(codecs)
+    return True
+
+
+def load_codecs(module_name: str) -> bool:
+    """
+    Import generated codecs module if it exists
+
+    :param module_name: name of generated module
+    :return: whether module exists
+    """
+    try:
+        importlib.import_module(module_name)
+    except ModuleNotFoundError as e:
+        if e.name != module_name:
+            raise
+        return False
+    return True
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m pyjackson.compile',
+                                     description='Generate codecs for serializable classes of modules')
+    parser.add_argument('modules', nargs='+', help='modules to compile')
+    parser.add_argument('-o', '--output', help='path of generated module, stdout by default')
+    args = parser.parse_args(argv)
+    if '' not in sys.path:
+        sys.path.insert(0, '')
+    source = generate_codecs(*args.modules)
+    if args.output is None:
+        sys.stdout.write(source)
+    else:
+        with open(args.output, 'w', encoding='utf8') as f:
+            f.write(source)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
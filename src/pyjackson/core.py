@@ -3,6 +3,10 @@ import typing
 from enum import Enum
 
 CLASS_SPECS_CACHE = dict()
+CLASS_GETTERS_CACHE = dict()
+STRUCT_LAYOUTS_CACHE = dict()
+# class -> (encode, decode) functions generated by pyjackson.compile
+GENERATED_CODECS = dict()
 TYPE_FIELD_NAME_FIELD_NAME = '_type_field_name'
 TYPE_FIELD_NAME_FIELD_POSITION = '_type_field_position'
 TYPE_FIELD_NAME_FIELD_ROOT = '_type_field_root'
@@ -11,6 +15,9 @@ TYPE_AS_LIST = '_type_as_list'
 BUILTIN_TYPES = {
     int, float, str, type(None), bool, list, dict
 }
+SCALAR_TYPES = {
+    int, float, str, bool
+}
 SERIALIZABLE_DICT_TYPES = {
     str, int, float
 }
@@ -31,6 +38,8 @@ class Unserializable:
 
 
 class Comparable:
+    __slots__ = ()
+
     def __eq__(self, other):
         cls = type(self)
         if cls != type(other):
@@ -4,7 +4,7 @@ from copy import copy
 from pyjackson import utils
 from pyjackson.core import (FIELD_MAPPING_NAME_FIELD, TYPE_AS_LIST, TYPE_FIELD_NAME_FIELD_NAME,
                             TYPE_FIELD_NAME_FIELD_POSITION, TYPE_FIELD_NAME_FIELD_ROOT, Position)
-from pyjackson.generics import _register_serializer
+from pyjackson.generics import _register_serializer, _register_subtypes_serializer
 from pyjackson.utils import get_class_field_names
 
 
@@ -132,6 +132,18 @@ def real_types(*types):
     return dec
 
 
+def real_subtypes(*base_types):
+    """Register generic serializer for all subclasses of base types.
+    Serializer for concrete subclass is created by calling serializer with this subclass as first argument"""
+
+    def dec(cls):
+        for t in base_types:
+            _register_subtypes_serializer(cls, t)
+        return cls
+
+    return dec
+
+
 def rename_fields(**field_mapping):
     """
     Change name of fields in payload. This behavior is inheritable and overridable for child classes
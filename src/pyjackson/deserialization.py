@@ -1,12 +1,13 @@
 from typing import Any, Hashable, Type
 
-from pyjackson.core import BUILTIN_TYPES, FIELD_MAPPING_NAME_FIELD, SERIALIZABLE_DICT_TYPES, Field, Position
+from pyjackson.core import (BUILTIN_TYPES, FIELD_MAPPING_NAME_FIELD, GENERATED_CODECS, SCALAR_TYPES,
+                            SERIALIZABLE_DICT_TYPES, Field, Position)
 from pyjackson.errors import DeserializationError
 from pyjackson.generics import SERIALIZER_MAPPING, Serializer, SerializerType, StaticSerializer
 from pyjackson.utils import (get_class_fields, get_collection_internal_type, get_collection_type, get_mapping_types,
-                             get_tuple_internal_types, has_subtype_alias, is_aslist, is_collection, is_generic,
-                             is_hierarchy_root, is_mapping, is_tuple, is_union, resolve_subtype, type_field_position_is,
-                             union_args)
+                             get_tuple_internal_types, has_serializer, has_subtype_alias, is_aslist, is_collection,
+                             is_generic, is_hierarchy_root, is_mapping, is_namedtuple, is_tuple, is_union,
+                             resolve_subtype, type_field_position_is, union_args)
 
 
 def _get_field_type(field: Field, obj):
@@ -17,6 +18,13 @@ def _get_field_type(field: Field, obj):
     return field_type
 
 
+def _deserialize_field(obj, as_class):
+    if type(obj) is as_class and as_class in SCALAR_TYPES:
+        # deserialize would return it as is
+        return obj
+    return deserialize(obj, as_class)
+
+
 def _construct_from_list(obj, as_class):
     args = []
     if type_field_position_is(as_class, Position.INSIDE):
@@ -30,7 +38,7 @@ def _construct_from_list(obj, as_class):
             else:
                 raise ValueError("Too few arguments for type  {} ".format(as_class))
         else:
-            args.append(deserialize(obj[i], field_type))
+            args.append(_deserialize_field(obj[i], field_type))
     return as_class(*args)
 
 
@@ -49,19 +57,34 @@ def _construct_from_dict(obj, as_class):
             else:
                 raise ValueError("Type {} has required argument {}".format(as_class, name))
         else:
-            kwargs[f.name] = deserialize(obj[name], field_type)
+            kwargs[f.name] = _deserialize_field(obj[name], field_type)
     return as_class(**kwargs)
 
 
+def _construct_namedtuple(obj, as_class):
+    fields = get_class_fields(as_class)
+    values = [_deserialize_field(o, f.type) for f, o in zip(fields, obj)]
+    for f in fields[len(values):]:
+        if not f.has_default:
+            raise ValueError("Too few arguments for type  {} ".format(as_class))
+        values.append(f.default)
+    return as_class._make(values)
+
+
 def _construct_from(obj, as_class):
-    if is_aslist(as_class):
+    codec = GENERATED_CODECS.get(as_class)
+    if codec is not None:
+        return codec[1](obj)
+    if is_namedtuple(as_class) and isinstance(obj, list):
+        return _construct_namedtuple(obj, as_class)
+    elif is_aslist(as_class):
         return _construct_from_list(obj, as_class)
     else:
         return _construct_from_dict(obj, as_class)
 
 
 def _construct_object(obj, as_class: Type):
-    if isinstance(as_class, Hashable) and as_class in SERIALIZER_MAPPING:
+    if has_serializer(as_class):
         as_class = SERIALIZER_MAPPING[as_class]
 
     if issubclass(as_class, StaticSerializer):
@@ -2,21 +2,78 @@ import inspect
 import sys
 from abc import abstractmethod
 from functools import lru_cache, wraps
+from importlib import import_module
 from typing import Hashable, Type, Union
 
+from pyjackson import utils
 from pyjackson.core import TYPE_FIELD_NAME_FIELD_NAME
-from pyjackson.utils import flat_dict_repr, is_descriptor, turn_args_to_kwargs
 
 SERIALIZER_MAPPING = dict()
+SUBTYPES_SERIALIZER_MAPPING = dict()
+_subtypes_serializer_bases = tuple()
+
+# module with default serializers, it is imported on first serializer lookup (see _ensure_builtins)
+_BUILTIN_TYPES_MODULE = 'pyjackson.builtin_types'
+_builtins_imported = False
 
 _pv_major, _pv_minor = sys.version_info[:2]
+_Py_TPFLAGS_BASETYPE = 1 << 10
+
+
+def _is_default_serializer(cls):
+    return getattr(cls, '__module__', None) == _BUILTIN_TYPES_MODULE
+
+
+def _can_replace(cls, current):
+    """Default serializers do not replace user serializers registered before builtin types were imported"""
+    return current is None or not _is_default_serializer(cls) or _is_default_serializer(current)
 
 
 def _register_serializer(cls, real_type):
     """Register cls as serializer for real_type"""
     if real_type is not None:
         if isinstance(real_type, Hashable) and real_type != list and real_type != dict:
-            SERIALIZER_MAPPING[real_type] = cls
+            if _can_replace(cls, SERIALIZER_MAPPING.get(real_type)):
+                SERIALIZER_MAPPING[real_type] = cls
+
+
+def _register_subtypes_serializer(cls, base_type):
+    """Register generic serializer cls for all subclasses of base_type.
+    Serializer for subclass is created as cls(subclass) when it is first needed"""
+    global _subtypes_serializer_bases
+    if _can_replace(cls, SUBTYPES_SERIALIZER_MAPPING.get(base_type)):
+        SUBTYPES_SERIALIZER_MAPPING[base_type] = cls
+        _subtypes_serializer_bases = tuple(SUBTYPES_SERIALIZER_MAPPING)
+
+
+def _ensure_builtins():
+    """Import default serializers, so they are registered whichever pyjackson modules were imported"""
+    global _builtins_imported
+    if not _builtins_imported:
+        # flag is set after import, so other threads wait for import lock instead of seeing half-empty mapping
+        import_module(_BUILTIN_TYPES_MODULE)
+        _builtins_imported = True
+
+
+def _resolve_serializer(real_type):
+    """Get serializer registered for real_type or for one of its base classes (by MRO).
+    In latter case serializer is created and registered for real_type, so next lookups are plain dict lookups
+
+    :param real_type: hashable type
+    :return: serializer or None
+    """
+    serializer = SERIALIZER_MAPPING.get(real_type)
+    if serializer is None and not _builtins_imported:
+        _ensure_builtins()
+        serializer = SERIALIZER_MAPPING.get(real_type)
+    if serializer is None and isinstance(real_type, type) and issubclass(real_type, _subtypes_serializer_bases):
+        for base in real_type.__mro__[1:]:
+            factory = SUBTYPES_SERIALIZER_MAPPING.get(base)
+            if factory is not None:
+                serializer = factory(real_type)
+                SERIALIZER_MAPPING[real_type] = serializer
+                break
+    return serializer
 
 
 class _SerializerMetaMeta(type):
@@ -44,17 +101,23 @@ class _SerializerMetaMeta(type):
         return getattr(cls, '_dynamic', False)
 
 
+def _is_subclassable(cls):
+    """False for final types like bool or memoryview"""
+    return not isinstance(cls, type) or bool(cls.__flags__ & _Py_TPFLAGS_BASETYPE)
+
+
 class _SerializerMeta(type, metaclass=_SerializerMetaMeta):
     """
     Metaclass for :class:`Serializer`
 
-    Adds serializer's real_type as it's base class and implements custom type and comparison logic.
+    Adds serializer's real_type as it's base class (if it can be subclassed) and implements custom type
+    and comparison logic.
     It is needed to support correct isinstance, issubclass and == behaviour in some cases.
     """
 
     def __new__(mcs, name, bases, namespace):
         real_type = namespace.get('real_type')
-        if real_type is not None and real_type not in bases:
+        if real_type is not None and real_type not in bases and _is_subclassable(real_type):
             bases = bases + (real_type,)
         return super(_SerializerMeta, mcs).__new__(mcs, name, bases, namespace)
 
@@ -100,12 +163,26 @@ class _SerializerMeta(type, metaclass=_SerializerMetaMeta):
         return getattr(cls, '_init_args', tuple())
 
 
+@lru_cache(None)
+def _init_arguments(init):
+    """Names and defaults of serializer `__init__` arguments. Computed once per `__init__`,
+    because introspection is too slow to do it on every serializer instantiation"""
+    fields = utils.get_function_fields(init, types_required=False)
+    return [f.name for f in fields], [(f.name, f.default) for f in fields if f.has_default]
+
+
 def _type_cache(func):
     cached = lru_cache(None)(func)
 
     @wraps(func)
     def inner(cls, *args, **kwargs):
-        kwargs = turn_args_to_kwargs(cls.__init__, args, kwargs)
+        names, defaults = _init_arguments(cls.__init__)
+        values = dict(zip(names, args), **kwargs)
+        for name, default in defaults:
+            values.setdefault(name, default)
+        # same order of arguments for cache key, however they were passed
+        kwargs = {name: values.pop(name) for name in names if name in values}
+        kwargs.update(values)
         try:
             return cached(cls, **kwargs)
         except TypeError:
@@ -170,7 +247,7 @@ def _transform_to_class_methods(cls):
                 class_attrs[name] = classmethod(attr)
         elif inspect.isdatadescriptor(attr):
             metaclass_attrs[name] = attr
-        elif is_descriptor(attr):
+        elif utils.is_descriptor(attr):
             class_attrs[name] = _class_no_data_descriptor(cls, attr)
 
     for name, attr in class_attrs.items():
@@ -196,7 +273,7 @@ class Serializer(metaclass=_SerializerMeta):
             _transform_to_class_methods(cls)
             return cls
         if has_init:
-            kwargs_str = flat_dict_repr(kwargs, func_order=cls.__init__)
+            kwargs_str = utils.flat_dict_repr(kwargs, func_order=cls.__init__)
         else:
             kwargs_str = ''
 
@@ -1,31 +1,95 @@
+import gc
+import glob
+import io
 import json
-from typing import Type, TypeVar
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import ExitStack, contextmanager
+from itertools import islice
+from stat import S_ISREG
+from typing import Iterable, Iterator, List, Tuple, Type, TypeVar
 
+from . import _msgpack
+from .builtin_types import binary_payloads
+from .core import Comparable
 from .deserialization import deserialize
+from .errors import DeserializationError
 from .serialization import serialize
 
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
 
-def loads(payload: str, as_class: type):
+
+_bulk_lock = threading.Lock()
+_bulk_depth = 0
+_gc_was_enabled = False
+
+
+@contextmanager
+def bulk_load(freeze: bool = False):
+    """
+    Context manager which disables cyclic garbage collector, so it does not run again and again
+    while millions of new objects are created by deserialization. Can be nested and used from many threads:
+    GC is enabled back (if it was enabled) when the last context exits
+
+    :param freeze: call :func:`gc.freeze` on exit (python 3.7+), moving all objects including deserialized ones
+        to permanent generation, so they are never scanned by GC. Use it for long-lived results
+    """
+    global _bulk_depth, _gc_was_enabled
+    with _bulk_lock:
+        if _bulk_depth == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _bulk_depth += 1
+    try:
+        yield
+    finally:
+        with _bulk_lock:
+            if freeze and hasattr(gc, 'freeze'):
+                gc.freeze()
+            _bulk_depth -= 1
+            if _bulk_depth == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+@contextmanager
+def _maybe_bulk_load(bulk: bool):
+    if not bulk:
+        yield
+        return
+    with bulk_load():
+        yield
+
+
+def loads(payload: str, as_class: type, bulk: bool = False):
     """
     Deserialize `payload` to `as_class` instance
 
     :param payload: JSON string
     :param as_class: type or serializer
+    :param bulk: disable GC while deserializing, see :func:`bulk_load`
     :return: deserialized instance of as_class (or real_type of serializer)
     """
-    obj = json.loads(payload)
-    return deserialize(obj, as_class)
+    with _maybe_bulk_load(bulk):
+        obj = json.loads(payload)
+        return deserialize(obj, as_class)
 
 
-def load(fp, as_class: type):
+def load(fp, as_class: type, bulk: bool = False):
     """
     Deserialize content of file-like `fp` to `as_class` instance
 
     :param fp: file-like object to read
     :param as_class: type or serializer
+    :param bulk: disable GC while deserializing, see :func:`bulk_load`
     :return: deserialized instance of as_class (or real_type of serializer)
     """
-    return loads(fp.read(), as_class)
+    return loads(fp.read(), as_class, bulk)
 
 
 def dumps(obj, as_class: type = None):
@@ -52,29 +116,519 @@ def dump(fp, obj, as_class: type = None):
     return fp.write(dumps(obj, as_class))
 
 
+def dumpb_msgpack(obj, as_class: type = None) -> bytes:
+    """
+    Serialize obj to MessagePack bytes as `as_class`.
+    Binary values (bytes, memoryview, packed arrays) are stored as msgpack binary instead of base64 strings.
+    Uses msgpack package if it is installed and bundled pure-python encoder otherwise
+
+    :param obj: object to serialize
+    :param as_class: type or serializer
+    :return: msgpack bytes
+    """
+    with binary_payloads():
+        payload = serialize(obj, as_class)
+    if msgpack is not None:
+        return msgpack.packb(payload, use_bin_type=True)
+    return _msgpack.packb(payload)
+
+
+def loadb_msgpack(payload: bytes, as_class: type):
+    """
+    Deserialize MessagePack `payload` to `as_class` instance
+
+    :param payload: msgpack bytes
+    :param as_class: type or serializer
+    :return: deserialized instance of as_class (or real_type of serializer)
+    """
+    if msgpack is not None:
+        obj = msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    else:
+        obj = _msgpack.unpackb(payload)
+    return deserialize(obj, as_class)
+
+
 T = TypeVar('T')
 
+_BUFFER_SIZE = 1 << 20
+_COMPRESSION_MAGIC = [(b'\x1f\x8b', 'gzip'), (b'BZh', 'bz2'), (b'\xfd7zXZ\x00', 'xz'), (b'\x28\xb5\x2f\xfd', 'zstd')]
+_COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.gzip': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.zst': 'zstd', '.zstd': 'zstd'}
+
+
+def _sniff_compression(f: io.BufferedReader):
+    """Detect compression of buffered binary file by magic bytes. Bytes are peeked, so they are not consumed
+    and stream can still be read from the start (even if it is a pipe)"""
+    head = f.peek(6)[:6]
+    for magic, compression in _COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def detect_compression(path: str, mode: str = 'r'):
+    """
+    Detect compression of file: by magic bytes for existing files if `mode` is 'r' and by extension otherwise.
+    File is opened to read magic bytes, so use :func:`open_file` with `compression='infer'` for pipes
+
+    :param path: path to file
+    :param mode: 'r' or 'w'
+    :return: one of 'gzip', 'bz2', 'xz', 'zstd' or None for uncompressed files
+    """
+    if mode == 'r':
+        with open(path, 'rb') as f:
+            return _sniff_compression(f)
+    return _COMPRESSION_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+class _DecompressedReader(io.BufferedReader):
+    """Buffered reader of decompressor which also closes compressed file object (decompressors do not close
+    file objects passed to them)"""
 
-def read(path: str, as_class: Type[T]) -> T:
+    def __init__(self, raw, buffer_size: int, fileobj):
+        super(_DecompressedReader, self).__init__(raw, buffer_size)
+        self._fileobj = fileobj
+
+    def close(self):
+        try:
+            super(_DecompressedReader, self).close()
+        finally:
+            self._fileobj.close()
+
+
+def _decompress(f, compression: str):
+    """Decompressing binary reader of compressed binary file object"""
+    if compression == 'gzip':
+        import gzip
+        return gzip.GzipFile(fileobj=f, mode='rb')
+    elif compression == 'bz2':
+        import bz2
+        return bz2.BZ2File(f, 'rb')
+    elif compression == 'xz':
+        import lzma
+        return lzma.LZMAFile(f, 'rb')
+    elif compression == 'zstd':
+        return _zstandard().ZstdDecompressor().stream_reader(f, closefd=False)
+    raise ValueError('Unknown compression {}'.format(compression))
+
+
+def _compress(path: str, compression: str):
+    """Compressing binary writer to `path`"""
+    if compression == 'gzip':
+        import gzip
+        return gzip.open(path, 'wb', compresslevel=6)
+    elif compression == 'bz2':
+        import bz2
+        return bz2.open(path, 'wb')
+    elif compression == 'xz':
+        import lzma
+        return lzma.open(path, 'wb')
+    elif compression == 'zstd':
+        zstandard = _zstandard()
+        return zstandard.ZstdCompressor().stream_writer(open(path, 'wb'), closefd=True, write_return_read=True)
+    raise ValueError('Unknown compression {}'.format(compression))
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError('zstandard is required for zstd compressed files, install it with pip install pyjackson[zstd]')
+    return zstandard
+
+
+def _text_reader(f: io.BufferedReader, compression: str):
+    """Text reader of buffered binary file `f`, which is closed with it"""
+    if compression is None:
+        return io.TextIOWrapper(f, encoding='utf8')
+    try:
+        return io.TextIOWrapper(_DecompressedReader(_decompress(f, compression), _BUFFER_SIZE, f), encoding='utf8')
+    except BaseException:
+        f.close()
+        raise
+
+
+def open_file(path: str, mode: str = 'r', compression: str = 'infer'):
+    """
+    Open text file, transparently decompressing it on read and compressing on write.
+    Data is streamed through the codec with large buffers, so compressed file is never fully loaded to memory.
+    On read file is opened once and compression is detected by peeking its magic bytes, so pipes are supported too
+
+    :param path: path to file
+    :param mode: 'r' or 'w'
+    :param compression: 'infer' to detect by magic bytes on read and by extension on write (see
+        :func:`detect_compression`), None for no compression, or one of 'gzip', 'bz2', 'xz', 'zstd'
+    :return: text file object
+    """
+    if mode == 'r':
+        f = open(path, 'rb', buffering=_BUFFER_SIZE)
+        if compression == 'infer':
+            compression = _sniff_compression(f)
+        return _text_reader(f, compression)
+    if mode != 'w':
+        raise ValueError('Unsupported mode {}'.format(mode))
+    if compression == 'infer':
+        compression = detect_compression(path, mode)
+    if compression is None:
+        return open(path, mode, encoding='utf8', buffering=_BUFFER_SIZE)
+    return io.TextIOWrapper(io.BufferedWriter(_compress(path, compression), _BUFFER_SIZE), encoding='utf8')
+
+
+def read(path: str, as_class: Type[T], bulk: bool = False) -> T:
     """
     Deserialize object from file in `path` as as_class
 
-    :param path: path to file with JSON representation
+    :param path: path to file with JSON representation, possibly compressed (see :func:`open_file`)
     :param as_class: type or serializer
+    :param bulk: disable GC while deserializing, see :func:`bulk_load`
     :return: deserialized instance of as_class (or real_type of serializer)
     """
-    with open(path, 'r', encoding='utf8') as f:
-        return load(f, as_class)
+    with open_file(path) as f:
+        return load(f, as_class, bulk)
 
 
 def write(path: str, obj, as_class: type = None):
     """
     Serialize `obj` to JSON and write it to `path`
 
-    :param path: path to write JSON representation
+    :param path: path to write JSON representation, compressed if it has compression extension (eg `.gz`)
     :param obj: object to serialize
     :param as_class: type or serializer
     :return: bytes written
     """
-    with open(path, 'w', encoding='utf8') as f:
+    with open_file(path, 'w') as f:
         return dump(f, obj, as_class)
+
+
+READ_CACHE_SIZE = 128
+# (path, as_class) -> (file size, file mtime, last stat time, object)
+_read_cache = OrderedDict()
+_read_cache_lock = threading.Lock()
+
+
+def cached_read(path: str, as_class: Type[T], stat_interval: float = 0) -> T:
+    """
+    Same as :func:`read`, but deserialized objects are cached (in LRU cache of size `READ_CACHE_SIZE`)
+    and file is read again only if its size or modification time changed.
+    Cached object is returned as is, so it must not be modified
+
+    :param path: path to file with JSON representation
+    :param as_class: type or serializer, must be hashable
+    :param stat_interval: if file was checked less than `stat_interval` seconds ago, it is not checked again
+    :return: deserialized instance of as_class (or real_type of serializer)
+    """
+    key = (path, as_class)
+    now = time.monotonic()
+    with _read_cache_lock:
+        entry = _read_cache.get(key)
+        if entry is not None:
+            _read_cache.move_to_end(key)
+            if now - entry[2] < stat_interval:
+                return entry[3]
+    stat = os.stat(path)
+    if entry is not None and (entry[0], entry[1]) == (stat.st_size, stat.st_mtime_ns):
+        obj = entry[3]
+    else:
+        obj = read(path, as_class)
+    with _read_cache_lock:
+        _read_cache[key] = (stat.st_size, stat.st_mtime_ns, now, obj)
+        _read_cache.move_to_end(key)
+        while len(_read_cache) > READ_CACHE_SIZE:
+            _read_cache.popitem(last=False)
+    return obj
+
+
+def clear_read_cache():
+    """Clear cache of :func:`cached_read`"""
+    with _read_cache_lock:
+        _read_cache.clear()
+
+
+def _read_text(path: str) -> str:
+    with open_file(path) as f:
+        return f.read()
+
+
+def _imap(executor, func, items: Iterable, ordered: bool, window: int) -> Iterator:
+    """Map func over items in executor, with at most `window` items in flight. Yields (item, result)"""
+    items = iter(items)
+    pending = deque() if ordered else set()
+
+    def submit():
+        for item in items:
+            future = executor.submit(func, item)
+            future.item = item
+            if ordered:
+                pending.append(future)
+            else:
+                pending.add(future)
+            return
+
+    for _ in range(window):
+        submit()
+    while pending:
+        if ordered:
+            done = [pending.popleft()]
+        else:
+            from concurrent.futures import FIRST_COMPLETED, wait
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            pending.difference_update(done)
+        for future in done:
+            submit()
+            yield future.item, future.result()
+
+
+def read_dir(path: str, as_class: Type[T], pattern: str = '*.json', workers: int = None, processes: int = None,
+             ordered: bool = False) -> Iterator[Tuple[str, T]]:
+    """
+    Read and deserialize all files matching `pattern` in directory `path` in parallel.
+    Files are read in thread pool. If `processes` is set, they are deserialized in process pool,
+    otherwise in the same threads
+
+    :param path: path to directory
+    :param as_class: type or serializer, must be picklable if `processes` is set
+    :param pattern: glob pattern of files to read, relative to `path`
+    :param workers: number of threads, default is the same as for :class:`concurrent.futures.ThreadPoolExecutor`
+    :param processes: number of processes to deserialize in
+    :param ordered: yield files in sorted order instead of in order of completion
+    :return: iterator over (file path, deserialized object) pairs
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    paths = sorted(p for p in glob.glob(os.path.join(path, pattern)) if os.path.isfile(p))
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    process_pool = ProcessPoolExecutor(processes) if processes else None
+
+    def read_file(file_path):
+        if process_pool is None:
+            return read(file_path, as_class)
+        return process_pool.submit(loads, _read_text(file_path), as_class).result()
+
+    try:
+        with ThreadPoolExecutor(workers) as thread_pool:
+            yield from _imap(thread_pool, read_file, paths, ordered, window=workers * 2)
+    finally:
+        if process_pool is not None:
+            process_pool.shutdown()
+
+
+def load_lines(fp, as_class: Type[T]) -> Iterator[T]:
+    """
+    Lazily deserialize NDJSON (one JSON object per line) content of file-like `fp`
+
+    :param fp: file-like object to read
+    :param as_class: type or serializer
+    :return: iterator over instances of as_class
+    """
+    for line in fp:
+        if line.strip():
+            yield loads(line, as_class)
+
+
+def dump_lines(fp, objs: Iterable, as_class: type = None):
+    """
+    Serialize objs as NDJSON (one JSON object per line) and write it to file-like `fp`
+
+    :param fp: file-like object to write
+    :param objs: objects to serialize
+    :param as_class: type or serializer for each object
+    :return: number of characters written
+    """
+    return sum(fp.write(dumps(o, as_class) + '\n') for o in objs)
+
+
+def write_lines(path: str, objs: Iterable, as_class: type = None):
+    """
+    Serialize objs as NDJSON and write it to `path`
+
+    :param path: path to write NDJSON, compressed if it has compression extension (eg `.gz`)
+    :param objs: objects to serialize
+    :param as_class: type or serializer for each object
+    :return: number of characters written
+    """
+    with open_file(path, 'w') as f:
+        return dump_lines(f, objs, as_class)
+
+
+@contextmanager
+def _mmap(f):
+    """Read-only memory map of open file. Pages are shared with OS page cache, so they are not copied
+    to process memory"""
+    if os.fstat(f.fileno()).st_size == 0:
+        # empty files cannot be mapped
+        yield b''
+        return
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        yield m
+
+
+@contextmanager
+def _mmap_file(path: str):
+    """Read-only memory map of uncompressed file in `path`"""
+    with open(path, 'rb') as f:
+        if _sniff_compression(f) is not None:
+            raise ValueError('Cannot memory map compressed file {}'.format(path))
+        with _mmap(f) as m:
+            yield m
+
+
+def _line_offsets(m) -> Iterator[int]:
+    start, size = 0, len(m)
+    while start < size:
+        end = m.find(b'\n', start)
+        if end == -1:
+            end = size
+        # copy line to check if it is blank only if it starts with whitespace
+        if end > start and (m[start] not in b' \t\r' or m[start:end].strip()):
+            yield start
+        start = end + 1
+
+
+def ndjson_offsets(path: str) -> List[int]:
+    """
+    Get offsets of records in NDJSON file. Empty lines are skipped
+
+    :param path: path to uncompressed NDJSON file
+    :return: list of byte offsets of lines with records
+    """
+    with _mmap_file(path) as m:
+        return list(_line_offsets(m))
+
+
+def read_lines(path: str, as_class: Type[T], offsets: Iterable[int] = None) -> Iterator[T]:
+    """
+    Lazily deserialize records from NDJSON file in `path`. File is memory mapped and every record is parsed
+    from its own slice of the mapping, so only records which are read are loaded into process memory.
+    Compressed files and pipes are streamed (through decompressor) instead
+
+    :param path: path to NDJSON file
+    :param as_class: type or serializer for each record
+    :param offsets: byte offsets of records to read (eg from :func:`ndjson_offsets`), all records by default.
+        Not supported for compressed files and pipes
+    :return: iterator over instances of as_class
+    """
+    with open(path, 'rb', buffering=_BUFFER_SIZE) as f:
+        compression = _sniff_compression(f)
+        if compression is not None or not S_ISREG(os.fstat(f.fileno()).st_mode):
+            if offsets is not None:
+                raise ValueError('Cannot read records by offsets from compressed file or pipe {}'.format(path))
+            with _text_reader(f, compression) as text:
+                yield from load_lines(text, as_class)
+            return
+        with _mmap(f) as m:
+            for start in (_line_offsets(m) if offsets is None else offsets):
+                end = m.find(b'\n', start)
+                yield deserialize(json.loads(m[start:end if end != -1 else len(m)]), as_class)
+
+
+SHARDS_MANIFEST = 'manifest.json'
+
+
+class ShardManifest(Comparable):
+    """Description of collection written with :func:`write_sharded`.
+    Records are split into batches of `batch_size`, batch `i` is written to shard `i % len(shards)`
+
+    :param shards: shard file names
+    :param counts: number of records in each shard
+    :param batch_size: number of consecutive records written to the same shard
+    """
+
+    def __init__(self, shards: List[str], counts: List[int], batch_size: int):
+        self.shards = shards
+        self.counts = counts
+        self.batch_size = batch_size
+
+
+def _pool(processes: int, threads: int):
+    # concurrent.futures.process imports multiprocessing, which is slow
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    return ProcessPoolExecutor(processes) if processes else ThreadPoolExecutor(threads)
+
+
+def _dump_batch(batch: list, as_class) -> str:
+    return ''.join(dumps(o, as_class) + '\n' for o in batch)
+
+
+def _batches(objs: Iterable, batch_size: int) -> Iterator[list]:
+    objs = iter(objs)
+    batch = list(islice(objs, batch_size))
+    while batch:
+        yield batch
+        batch = list(islice(objs, batch_size))
+
+
+def write_sharded(directory: str, objs: Iterable, as_class: type = None, shards: int = 4, batch_size: int = 1000,
+                  processes: int = None, extension: str = '.ndjson') -> ShardManifest:
+    """
+    Serialize objs to `shards` NDJSON files in parallel and write :class:`ShardManifest` to `manifest.json`.
+    Can be read back with :func:`read_sharded`.
+    objs are consumed lazily: batches are serialized in parallel and appended to shards round-robin,
+    so only a few batches are kept in memory at once
+
+    :param directory: directory to write to, created if it does not exist
+    :param objs: objects to serialize
+    :param as_class: type or serializer for each object
+    :param shards: number of shards
+    :param batch_size: number of consecutive objects written to the same shard
+    :param processes: number of processes to serialize in, batches are serialized in threads by default
+    :param extension: extension of shard files. Use compression extension, eg `.ndjson.gz`, to compress shards
+    :return: :class:`ShardManifest`
+    """
+    os.makedirs(directory, exist_ok=True)
+    names = ['shard-{:05}{}'.format(i, extension) for i in range(shards)]
+    counts = [0] * shards
+    workers = processes or shards
+    with ExitStack() as stack:
+        files = [stack.enter_context(open_file(os.path.join(directory, name), 'w')) for name in names]
+        pool = stack.enter_context(_pool(processes, shards))
+        pending = deque()
+
+        def write_next():
+            shard, size, future = pending.popleft()
+            files[shard].write(future.result())
+            counts[shard] += size
+
+        for i, batch in enumerate(_batches(objs, batch_size)):
+            if len(pending) >= 2 * workers:
+                write_next()
+            pending.append((i % shards, len(batch), pool.submit(_dump_batch, batch, as_class)))
+        while pending:
+            write_next()
+
+    manifest = ShardManifest(names, counts, batch_size)
+    write(os.path.join(directory, SHARDS_MANIFEST), manifest)
+    return manifest
+
+
+def _read_shard(path: str, as_class, count: int) -> list:
+    result = list(read_lines(path, as_class))
+    if len(result) != count:
+        raise DeserializationError('Shard {} has {} records instead of {}'.format(path, len(result), count))
+    return result
+
+
+def read_sharded(directory: str, as_class: Type[T], ordered: bool = True, processes: int = None) -> Iterator[T]:
+    """
+    Read collection written with :func:`write_sharded`. Shards are read in parallel,
+    every shard is fully loaded before its records are yielded
+
+    :param directory: directory with shards and manifest
+    :param as_class: type or serializer for each object
+    :param ordered: yield objects in the same order they were written.
+        Otherwise objects are yielded by shards, in order of shard completion
+    :param processes: number of processes to read in, shards are read in threads by default
+    :return: iterator over instances of as_class
+    """
+    manifest = read(os.path.join(directory, SHARDS_MANIFEST), ShardManifest)
+    with _pool(processes, len(manifest.shards)) as pool:
+        futures = [pool.submit(_read_shard, os.path.join(directory, name), as_class, count)
+                   for name, count in zip(manifest.shards, manifest.counts)]
+        if not ordered:
+            from concurrent.futures import as_completed
+            for future in as_completed(futures):
+                yield from future.result()
+            return
+        results = [f.result() for f in futures]
+
+    size, shards = manifest.batch_size, len(results)
+    for i in range(-(-sum(manifest.counts) // size)):
+        start = i // shards * size
+        yield from results[i % shards][start:start + size]
@@ -0,0 +1,363 @@
+"""Explicit-stack implementation of :func:`pyjackson.serialize` and :func:`pyjackson.deserialize`
+
+Recursive implementations use one (or several) python frames per nesting level, so deep structures
+(like long linked lists) hit :class:`RecursionError`. Functions in this module walk the structure with a list
+used as a stack and produce exactly the same results as their recursive counterparts.
+Custom serializers are still called as usual, so if they call :func:`pyjackson.serialize` themselves,
+that part will be recursive.
+"""
+from typing import Any, Hashable
+
+from pyjackson.core import BUILTIN_TYPES, FIELD_MAPPING_NAME_FIELD, SCALAR_TYPES, SERIALIZABLE_DICT_TYPES, Position
+from pyjackson.deserialization import _get_field_type
+from pyjackson.errors import DeserializationError, SerializationError, UnserializableError
+from pyjackson.generics import SERIALIZER_MAPPING, Serializer, SerializerType, StaticSerializer
+from pyjackson.serialization import _is_plain_scalar, _serialize_with_serializer
+from pyjackson.utils import (get_class_fields, get_class_fields_getter, get_collection_internal_type,
+                             get_collection_type, get_mapping_types, get_tuple_internal_types, get_type_field_name,
+                             has_serializer, has_subtype_alias, is_aslist, is_collection, is_generic, is_hierarchy_root,
+                             is_mapping, is_namedtuple, is_serializable, is_tuple, is_union, issubclass_safe,
+                             resolve_subtype, type_field_position_is, union_args)
+
+__all__ = ['serialize', 'deserialize']
+
+# Stack entries are tuples, first element is one of these opcodes.
+# Every entry that produces a value stores it as target[key]
+_VISIT = 0  # (_VISIT, obj, as_class, target, key)
+_UNION = 1  # (_UNION, obj, as_class, args, arg_index, target, key, slot) - popped when alternative succeeded
+_RAISE = 2  # (_RAISE, error) - error deferred until all previous siblings are processed
+_CALL_KWARGS = 3  # (_CALL_KWARGS, func, kwargs, target, key)
+_CALL_ARGS = 4  # (_CALL_ARGS, func, args, target, key)
+_CALL = 5  # (_CALL, func, arg, target, key)
+_ITEMS = 6  # (_ITEMS, values, as_class, target, keys, start) - next chunk of collection items to visit
+
+# max number of collection items pushed to stack at once, so big collections do not make single step long
+_ITEMS_CHUNK = 256
+
+
+def _push_children(stack, children, target):
+    # reversed, so children are popped (and processed) in the same order as in recursive implementation
+    for value, as_class, key in reversed(children):
+        stack.append((_VISIT, value, as_class, target, key))
+
+
+def _push_items(stack, values, as_class, target, keys=None, start=0):
+    """Schedule visit of values[start:start + _ITEMS_CHUNK] and then of the rest of values.
+    Values are stored into target[keys[i]] or into target[i] if keys is None"""
+    end = min(start + _ITEMS_CHUNK, len(values))
+    if end < len(values):
+        stack.append((_ITEMS, values, as_class, target, keys, end))
+    for i in range(end - 1, start - 1, -1):
+        stack.append((_VISIT, values[i], as_class, target, i if keys is None else keys[i]))
+
+
+def _next_union_alternative(stack, error, exhausted):
+    """Unwind stack to the closest union which has alternatives left and schedule next alternative.
+    Raises if there is no such union"""
+    while stack:
+        task = stack.pop()
+        if task[0] != _UNION:
+            continue
+        _, obj, as_class, args, index, target, key, slot = task
+        index += 1
+        if index < len(args):
+            stack.append((_UNION, obj, as_class, args, index, target, key, slot))
+            stack.append((_VISIT, obj, args[index], slot, 0))
+            return
+        error = exhausted(obj, as_class)
+    raise error
+
+
+def _serialize_object(stack, as_class, obj, target, key):
+    as_list = is_aslist(as_class)
+    result = [] if as_list else {}
+    children = []
+    error = None
+    mapping = getattr(as_class, FIELD_MAPPING_NAME_FIELD, None)
+    try:
+        for f, field in zip(get_class_fields(as_class), get_class_fields_getter(as_class)(obj)):
+            if field is None:
+                continue
+            if as_list:
+                children.append((field, None, len(result)))
+                result.append(None)
+            else:
+                name = f.name if mapping is None else mapping.get(f.name, f.name)
+                if _is_plain_scalar(field, f.type):
+                    result[name] = field
+                else:
+                    children.append((field, f.type, name))
+                    result[name] = None
+    except Exception as e:
+        error = e
+
+    if error is None and type_field_position_is(as_class, Position.INSIDE):
+        type_field_name = get_type_field_name(as_class)
+        if as_list:
+            result.insert(0, getattr(as_class, type_field_name))
+            children = [(field, field_type, index + 1) for field, field_type, index in children]
+        elif type_field_name in result:
+            error = SerializationError(
+                'Type field name {} conflicts with field name in {}'.format(type_field_name, as_class))
+        else:
+            result[type_field_name] = getattr(as_class, type_field_name)
+
+    target[key] = result
+    if error is not None:
+        stack.append((_RAISE, error))
+    _push_children(stack, children, result)
+
+
+def _serialize_node(stack, obj, as_class, target, key):
+    if as_class is Any:
+        target[key] = obj
+        return
+    if not is_serializable(obj):
+        raise UnserializableError(obj)
+
+    is_serializer_hierarchy = (issubclass_safe(as_class, Serializer)
+                               and issubclass_safe(obj, as_class)
+                               and not as_class._is_dynamic and obj._is_dynamic)
+    if issubclass_safe(obj, Serializer) and (as_class is None or is_serializer_hierarchy):
+        # serialize type itself
+        _serialize_object(stack, obj, obj, target, key)
+        return
+
+    if is_union(as_class):
+        args = union_args(as_class)
+        slot = [None]
+        stack.append((_UNION, obj, as_class, args, 0, target, key, slot))
+        stack.append((_VISIT, obj, args[0], slot, 0))
+        return
+
+    obj_type = type(obj)
+    if as_class is None or issubclass_safe(obj_type, as_class) and not issubclass_safe(as_class, Serializer):
+        as_class = obj_type
+
+    if has_serializer(as_class):
+        as_class = SERIALIZER_MAPPING[as_class]
+
+    if issubclass_safe(as_class, Serializer):
+        target[key] = _serialize_with_serializer(obj, as_class)
+    elif is_namedtuple(as_class):
+        result = [None] * len(obj)
+        target[key] = result
+        _push_children(stack, [(o, f.type, i) for i, (f, o) in enumerate(zip(get_class_fields(as_class), obj))],
+                       result)
+    elif isinstance(obj, (list, set, tuple)):
+        items = list(obj)
+        result = [None] * len(items)
+        target[key] = result
+        _push_children(stack, [(o, None, i) for i, o in enumerate(items)], result)
+    elif isinstance(obj, dict):
+        result = dict.fromkeys(obj)
+        target[key] = result
+        _push_children(stack, [(v, None, k) for k, v in obj.items()], result)
+    elif isinstance(as_class, Hashable) and as_class in BUILTIN_TYPES:
+        target[key] = obj
+    else:
+        _serialize_object(stack, as_class, obj, target, key)
+
+
+def _union_serialization_error(obj, as_class):
+    return SerializationError('None of the possible types matched for obj {} and type {}'.format(obj, as_class))
+
+
+def serialize(obj, as_class: SerializerType = None):
+    """
+    Convert object into JSON-compatible dict (or other  structure) without recursion.
+    Result is the same as for :func:`pyjackson.serialize`
+
+    :param obj: object to serialize
+    :param as_class: type to serialize as or serializer
+
+    :return: JSON-compatible object
+    """
+    root = [None]
+    stack = [(_VISIT, obj, as_class, root, 0)]
+    while stack:
+        task = stack.pop()
+        try:
+            op = task[0]
+            if op == _VISIT:
+                _serialize_node(stack, *task[1:])
+            elif op == _UNION:
+                task[5][task[6]] = task[7][0]
+            else:
+                raise task[1]
+        except SerializationError as e:
+            _next_union_alternative(stack, e, _union_serialization_error)
+    return root[0]
+
+
+def _construct_from_list(stack, obj, as_class, target, key):
+    args = []
+    children = []
+    error = None
+    if type_field_position_is(as_class, Position.INSIDE):
+        obj = obj[1:]
+    try:
+        for i, f in enumerate(get_class_fields(as_class)):
+            field_type = _get_field_type(f, obj)
+            if i >= len(obj):
+                if f.has_default:
+                    continue
+                raise ValueError("Too few arguments for type  {} ".format(as_class))
+            if type(obj[i]) is field_type and field_type in SCALAR_TYPES:
+                args.append(obj[i])
+            else:
+                children.append((obj[i], field_type, len(args)))
+                args.append(None)
+    except Exception as e:
+        error = e
+
+    stack.append((_CALL_ARGS, as_class, args, target, key) if error is None else (_RAISE, error))
+    _push_children(stack, children, args)
+
+
+def _construct_from_dict(stack, obj, as_class, target, key):
+    kwargs = {}
+    children = []
+    error = None
+    mapping = getattr(as_class, FIELD_MAPPING_NAME_FIELD, None)
+    try:
+        for f in get_class_fields(as_class):
+            field_type = _get_field_type(f, obj)
+            name = f.name if mapping is None else mapping.get(f.name, f.name)
+            if name not in obj:
+                if f.has_default:
+                    continue
+                raise ValueError("Type {} has required argument {}".format(as_class, name))
+            value = obj[name]
+            if type(value) is field_type and field_type in SCALAR_TYPES:
+                kwargs[f.name] = value
+            else:
+                children.append((value, field_type, f.name))
+                kwargs[f.name] = None
+    except Exception as e:
+        error = e
+
+    stack.append((_CALL_KWARGS, as_class, kwargs, target, key) if error is None else (_RAISE, error))
+    _push_children(stack, children, kwargs)
+
+
+def _construct_namedtuple(stack, obj, as_class, target, key):
+    fields = get_class_fields(as_class)
+    children = [(o, f.type, i) for i, (f, o) in enumerate(zip(fields, obj))]
+    values = [None] * len(children)
+    for f in fields[len(values):]:
+        if not f.has_default:
+            stack.append((_RAISE, ValueError("Too few arguments for type  {} ".format(as_class))))
+            break
+        values.append(f.default)
+    else:
+        stack.append((_CALL, as_class._make, values, target, key))
+    _push_children(stack, children, values)
+
+
+def _construct_object(stack, obj, as_class, target, key):
+    if has_serializer(as_class):
+        as_class = SERIALIZER_MAPPING[as_class]
+
+    if issubclass(as_class, StaticSerializer) or issubclass(as_class, Serializer) and as_class._is_dynamic:
+        target[key] = as_class.deserialize(obj)
+    elif is_namedtuple(as_class) and isinstance(obj, list):
+        _construct_namedtuple(stack, obj, as_class, target, key)
+    elif is_aslist(as_class):
+        _construct_from_list(stack, obj, as_class, target, key)
+    else:
+        _construct_from_dict(stack, obj, as_class, target, key)
+
+
+def _deserialize_node(stack, obj, as_class, target, key):
+    if as_class is Any:
+        target[key] = obj
+    elif is_generic(as_class):
+        if is_mapping(as_class):
+            key_type, value_type = get_mapping_types(as_class)
+            if key_type not in SERIALIZABLE_DICT_TYPES:
+                raise DeserializationError(
+                    f'mapping key type must be one of {SERIALIZABLE_DICT_TYPES}, not {key_type}. '
+                    f'error deserializing {obj}')
+            keys = [key_type(k) for k in obj]
+            result = dict.fromkeys(keys)
+            target[key] = result
+            _push_items(stack, list(obj.values()), value_type, result, keys)
+        elif is_tuple(as_class):
+            var_length, types = get_tuple_internal_types(as_class)
+            if var_length:
+                values = obj if isinstance(obj, (list, tuple)) else list(obj)
+                items = [None] * len(values)
+                stack.append((_CALL, tuple, items, target, key))
+                _push_items(stack, values, types, items)
+            else:
+                children = [(o, t, i) for i, (o, t) in enumerate(zip(obj, types))]
+                items = [None] * len(children)
+                stack.append((_CALL, tuple, items, target, key))
+                _push_children(stack, children, items)
+        elif is_collection(as_class):
+            seq_int_type = get_collection_internal_type(as_class)
+            seq_type = get_collection_type(as_class)
+            values = obj if isinstance(obj, (list, tuple)) else list(obj)
+            items = [None] * len(values)
+            stack.append((_CALL, seq_type, items, target, key))
+            _push_items(stack, values, seq_int_type, items)
+        else:
+            target[key] = None
+    elif isinstance(as_class, Hashable) and as_class in BUILTIN_TYPES:
+        target[key] = obj
+    elif not is_union(as_class):
+        if type_field_position_is(as_class, Position.INSIDE) and (is_hierarchy_root(as_class) or
+                                                                  has_subtype_alias(as_class, obj)):
+            as_class = resolve_subtype(as_class, obj)
+        _construct_object(stack, obj, as_class, target, key)
+    else:
+        args = union_args(as_class)
+        slot = [None]
+        stack.append((_UNION, obj, as_class, args, 0, target, key, slot))
+        stack.append((_VISIT, obj, args[0], slot, 0))
+
+
+def _union_deserialization_error(obj, as_class):
+    # not a TypeError, so it is not caught by outer unions, like in recursive implementation
+    raise DeserializationError("Cannot construct type {} from argument list {}".format(as_class, obj))
+
+
+def _deserialize_step(stack):
+    task = stack.pop()
+    try:
+        op = task[0]
+        if op == _VISIT:
+            _deserialize_node(stack, *task[1:])
+        elif op == _CALL_KWARGS:
+            task[3][task[4]] = task[1](**task[2])
+        elif op == _CALL_ARGS:
+            task[3][task[4]] = task[1](*task[2])
+        elif op == _CALL:
+            task[3][task[4]] = task[1](task[2])
+        elif op == _UNION:
+            task[5][task[6]] = task[7][0]
+        elif op == _ITEMS:
+            _push_items(stack, *task[1:])
+        else:
+            raise task[1]
+    except TypeError as e:
+        _next_union_alternative(stack, e, _union_deserialization_error)
+
+
+def deserialize(obj, as_class: SerializerType):
+    """Convert python dict into given class without recursion.
+    Result is the same as for :func:`pyjackson.deserialize`
+
+    :param obj: dict (or list or any primitive) to deserialize
+    :param as_class: type or serializer
+
+    :return: deserialized instance of as_class (or real_type of serializer)
+
+    :raise: DeserializationError
+    """
+    root = [None]
+    stack = [(_VISIT, obj, as_class, root, 0)]
+    while stack:
+        _deserialize_step(stack)
+    return root[0]
@@ -0,0 +1,201 @@
+"""Random-access index for NDJSON files.
+
+Index stores byte offset of every record (and optionally map from key field to record number)
+in sidecar file `<path>.idx`, so records can be read by position or key without scanning the file::
+
+    with NdjsonIndex.open('data.ndjson', key='id') as index:
+        obj = index.read(100500, MyType)
+        obj = index.read_key('some-id', MyType)
+
+Index is rebuilt by :meth:`NdjsonIndex.open` if data file was modified after it was created
+"""
+import array
+import json
+import os
+import struct
+import sys
+from typing import Hashable, Type, TypeVar
+
+from pyjackson.deserialization import deserialize
+from pyjackson.errors import DeserializationError
+from pyjackson.helpers import _line_offsets, _mmap_file
+
+__all__ = ['NdjsonIndex', 'index_path_for']
+
+T = TypeVar('T')
+
+_MAGIC = b'PJNDIDX1'
+# magic, data file size, data file mtime in ns, number of records, size of key map
+_HEADER = struct.Struct('<8sQQQQ')
+
+
+def index_path_for(path: str) -> str:
+    """Default path of index sidecar file for data file in `path`"""
+    return path + '.idx'
+
+
+def _stat(path: str):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class NdjsonIndex:
+    """Offsets of records in NDJSON file
+
+    :param path: path to NDJSON file
+    :param offsets: array with byte offsets of records
+    :param keys: map from key field value to record number
+    :param key: name of key field
+    """
+
+    def __init__(self, path: str, offsets: array.array, keys: dict = None, key: str = None):
+        self.path = path
+        self.offsets = offsets
+        self.keys = keys
+        self.key = key
+        self._file = None
+
+    @classmethod
+    def build(cls, path: str, key: str = None) -> 'NdjsonIndex':
+        """Scan NDJSON file and build its index
+
+        :param path: path to NDJSON file
+        :param key: name of field in records (as serialized) to build key map for
+        :return: :class:`NdjsonIndex`
+        :raise: DeserializationError if some record has no key field, its value is not hashable
+            or is the same as in another record
+        """
+        with _mmap_file(path) as m:
+            offsets = array.array('q', _line_offsets(m))
+            keys = None
+            if key is not None:
+                keys = {}
+                for i, start in enumerate(offsets):
+                    end = m.find(b'\n', start)
+                    record = json.loads(m[start:end if end != -1 else len(m)])
+                    if not isinstance(record, dict) or key not in record:
+                        raise DeserializationError('Record {} in {} has no key field "{}"'.format(i, path, key))
+                    value = record[key]
+                    try:
+                        duplicate = keys.setdefault(value, i)
+                    except TypeError:
+                        raise DeserializationError('Key field "{}" of record {} in {} is not hashable: {!r}'
+                                                   .format(key, i, path, value))
+                    if duplicate != i:
+                        raise DeserializationError('Records {} and {} in {} have the same key {!r}'
+                                                   .format(duplicate, i, path, value))
+        return cls(path, offsets, keys, key)
+
+    @classmethod
+    def load(cls, path: str, index_path: str = None) -> 'NdjsonIndex':
+        """Load index from sidecar file
+
+        :param path: path to NDJSON file
+        :param index_path: path to index file, `<path>.idx` by default
+        :return: :class:`NdjsonIndex`
+        :raise: DeserializationError if index is corrupted or data file was modified after index was built
+        """
+        with open(index_path or index_path_for(path), 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise DeserializationError('Index for {} is corrupted'.format(path))
+            magic, size, mtime, count, keys_size = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise DeserializationError('Index for {} is corrupted'.format(path))
+            if (size, mtime) != _stat(path):
+                raise DeserializationError('Index for {} is outdated'.format(path))
+            offsets = array.array('q')
+            offsets.frombytes(f.read(count * offsets.itemsize))
+            if len(offsets) != count:
+                raise DeserializationError('Index for {} is corrupted'.format(path))
+            if sys.byteorder == 'big':
+                offsets.byteswap()
+            key, keys = None, None
+            if keys_size > 0:
+                key, pairs = json.loads(f.read(keys_size))
+                keys = {k: i for k, i in pairs}
+        return cls(path, offsets, keys, key)
+
+    def save(self, index_path: str = None):
+        """Write index to sidecar file
+
+        :param index_path: path to index file, `<path>.idx` by default
+        """
+        size, mtime = _stat(self.path)
+        keys = b''
+        if self.keys is not None:
+            # list of pairs to keep types of keys
+            keys = json.dumps([self.key, list(self.keys.items())]).encode('utf8')
+        offsets = self.offsets
+        if sys.byteorder == 'big':
+            offsets = array.array('q', offsets)
+            offsets.byteswap()
+        with open(index_path or index_path_for(self.path), 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, size, mtime, len(offsets), len(keys)))
+            f.write(offsets.tobytes())
+            f.write(keys)
+
+    @classmethod
+    def open(cls, path: str, key: str = None, index_path: str = None) -> 'NdjsonIndex':
+        """Load index from sidecar file or build and save it if it is missing or outdated
+
+        :param path: path to NDJSON file
+        :param key: name of field in records to build key map for
+        :param index_path: path to index file, `<path>.idx` by default
+        :return: :class:`NdjsonIndex`
+        """
+        try:
+            index = cls.load(path, index_path)
+            if index.key == key:
+                return index
+        except (OSError, DeserializationError, ValueError):
+            pass
+        index = cls.build(path, key)
+        index.save(index_path)
+        return index
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def read_raw(self, position: int) -> bytes:
+        """Read raw JSON bytes of record
+
+        :param position: number of record
+        :return: bytes with record JSON
+        """
+        if self._file is None:
+            self._file = open(self.path, 'rb')
+        self._file.seek(self.offsets[position])
+        return self._file.readline()
+
+    def read(self, position: int, as_class: Type[T]) -> T:
+        """Read and deserialize one record
+
+        :param position: number of record
+        :param as_class: type or serializer
+        :return: deserialized instance of as_class (or real_type of serializer)
+        """
+        return deserialize(json.loads(self.read_raw(position)), as_class)
+
+    def read_key(self, key: Hashable, as_class: Type[T]) -> T:
+        """Read and deserialize record by value of key field
+
+        :param key: value of key field
+        :param as_class: type or serializer
+        :return: deserialized instance of as_class (or real_type of serializer)
+        :raise: KeyError if there is no such record
+        """
+        if self.keys is None:
+            raise ValueError('Index for {} has no key map'.format(self.path))
+        return self.read(self.keys[key], as_class)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,50 @@
+"""Serializers for :class:`numpy.ndarray`. Import this module to register them
+
+By default arrays are serialized as dict with dtype, shape and base64 of raw array buffer.
+To serialize array as nested lists, use :class:`NumpyNdarrayListSerializer` as type hint
+"""
+import numpy
+
+from pyjackson.builtin_types import decode_binary, encode_binary
+from pyjackson.errors import SerializationError
+from pyjackson.generics import StaticSerializer
+
+
+class NumpyNdarrayListSerializer(StaticSerializer):
+    """:class:`~pyjackson.generics.StaticSerializer` for :class:`numpy.ndarray` type.
+    Serializes array as `{'dtype': ..., 'shape': [...], 'data': [[...], ...]}`"""
+    real_type = numpy.ndarray
+
+    @classmethod
+    def deserialize(cls, obj: dict):
+        return numpy.array(obj['data'], dtype=obj['dtype']).reshape(obj['shape'])
+
+    @classmethod
+    def serialize(cls, instance: numpy.ndarray):
+        return {'dtype': instance.dtype.str, 'shape': list(instance.shape), 'data': instance.tolist()}
+
+
+# declared after NumpyNdarrayListSerializer to be registered as default serializer for numpy.ndarray
+class NumpyNdarraySerializer(StaticSerializer):
+    """:class:`~pyjackson.generics.StaticSerializer` for :class:`numpy.ndarray` type.
+    Serializes array as `{'dtype': ..., 'shape': [...], 'data': <base64 of array buffer>}`.
+    Arrays of objects are serialized with :class:`NumpyNdarrayListSerializer`.
+    Deserialized arrays share memory with decoded buffer, so they are read-only"""
+    real_type = numpy.ndarray
+
+    @classmethod
+    def deserialize(cls, obj: dict):
+        if not isinstance(obj['data'], (str, bytes, bytearray, memoryview)):
+            return NumpyNdarrayListSerializer.deserialize(obj)
+        buffer = decode_binary(obj['data'])
+        return numpy.frombuffer(buffer, dtype=obj['dtype']).reshape(obj['shape'])
+
+    @classmethod
+    def serialize(cls, instance: numpy.ndarray):
+        if instance.dtype.hasobject:
+            return NumpyNdarrayListSerializer.serialize(instance)
+        if instance.dtype.names is not None:
+            raise SerializationError('Structured arrays are not supported: {}'.format(instance.dtype))
+        data = numpy.ascontiguousarray(instance)  # no copy for contiguous arrays
+        return {'dtype': instance.dtype.str, 'shape': list(instance.shape),
+                'data': encode_binary(data)}
@@ -0,0 +1,162 @@
+"""Fixed-layout binary encoding for flat classes.
+
+For classes whose fields are all `int`, `float`, `bool` or :class:`FixedString`, :mod:`struct` layout is derived
+from type hints and objects are packed to fixed-size little-endian records: `int` is 8-byte signed integer,
+`float` is 8-byte double, `bool` is 1 byte and `FixedString(size)` is `size` bytes of utf8, padded with zeros.
+Records from :func:`pack_many` are stored back to back, so they can be read with :func:`iter_unpack`
+"""
+import struct
+from typing import Iterable, Iterator, Type, TypeVar
+
+from pyjackson.core import STRUCT_LAYOUTS_CACHE
+from pyjackson.errors import DeserializationError, SerializationError
+from pyjackson.generics import Serializer
+from pyjackson.utils import get_class_fields, get_class_fields_getter, is_namedtuple
+
+__all__ = ['FixedString', 'StructLayout', 'get_struct_layout', 'pack', 'unpack', 'pack_many', 'iter_unpack']
+
+T = TypeVar('T')
+
+_FORMATS = {int: 'q', float: 'd', bool: '?'}
+
+
+class FixedString(Serializer):
+    """:class:`~pyjackson.generics.Serializer` for strings with limited size.
+    Use `FixedString(size)` as type hint for string fields of classes which are packed with :func:`pack`.
+    In JSON it is serialized as a plain string
+
+    :param size: max size of utf8-encoded string in bytes
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def deserialize(self, obj: str):
+        return obj
+
+    def serialize(self, instance: str):
+        if len(instance.encode('utf8')) > self.size:
+            raise SerializationError('String {} is longer than {} bytes'.format(instance, self.size))
+        return instance
+
+
+def _field_format(cls, field) -> str:
+    if field.type in _FORMATS:
+        return _FORMATS[field.type]
+    if getattr(field.type, '_parent_class', None) is FixedString:
+        return '{}s'.format(field.type.size)
+    raise SerializationError('Cannot pack field {} of type {} of {}: only int, float, bool and FixedString '
+                             'fields are supported'.format(field.name, field.type, cls))
+
+
+class StructLayout:
+    """Binary layout of flat class
+
+    :param cls: flat class
+    """
+
+    def __init__(self, cls: type):
+        self.cls = cls
+        self.fields = get_class_fields(cls)
+        self.struct = struct.Struct('<' + ''.join(_field_format(cls, f) for f in self.fields))
+        self.size = self.struct.size
+        # positions and sizes of string fields
+        self.strings = [(i, f.type.size) for i, f in enumerate(self.fields) if f.type not in _FORMATS]
+        self.getter = get_class_fields_getter(cls)
+        self.factory = cls._make if is_namedtuple(cls) else lambda values: cls(*values)
+
+    def values(self, obj) -> tuple:
+        """Field values of obj in packing order"""
+        values = self.getter(obj)
+        if self.strings:
+            values = list(values)
+            for i, size in self.strings:
+                values[i] = values[i].encode('utf8')
+                if len(values[i]) > size:
+                    # struct silently truncates long strings
+                    raise SerializationError('Field {} of {} is longer than {} bytes'.format(
+                        self.fields[i].name, obj, size))
+        return values
+
+    def make(self, values: tuple):
+        """Create object from unpacked values"""
+        if self.strings:
+            values = list(values)
+            for i, _ in self.strings:
+                values[i] = values[i].rstrip(b'\0').decode('utf8')
+        return self.factory(values)
+
+
+def get_struct_layout(cls: type) -> StructLayout:
+    """Get (cached) binary layout of flat class
+
+    :param cls: flat class
+    :return: :class:`StructLayout`
+    :raise: SerializationError if class has fields which can not be packed
+    """
+    layout = STRUCT_LAYOUTS_CACHE.get(cls)
+    if layout is None:
+        layout = STRUCT_LAYOUTS_CACHE[cls] = StructLayout(cls)
+    return layout
+
+
+def pack(obj, as_class: type = None) -> bytes:
+    """
+    Pack flat object to bytes
+
+    :param obj: object to pack
+    :param as_class: flat class, type(obj) by default
+    :return: bytes with packed record
+    """
+    layout = get_struct_layout(as_class or type(obj))
+    try:
+        return layout.struct.pack(*layout.values(obj))
+    except (struct.error, AttributeError) as e:
+        raise SerializationError('Cannot pack {} as {}: {}'.format(obj, layout.cls, e))
+
+
+def unpack(buffer, as_class: Type[T]) -> T:
+    """
+    Unpack object from bytes
+
+    :param buffer: bytes-like object with exactly one packed record
+    :param as_class: flat class
+    :return: instance of as_class
+    """
+    layout = get_struct_layout(as_class)
+    try:
+        values = layout.struct.unpack(buffer)
+    except struct.error as e:
+        raise DeserializationError('Cannot unpack {}: {}'.format(as_class, e))
+    return layout.make(values)
+
+
+def pack_many(objs: Iterable, as_class: type) -> bytes:
+    """
+    Pack flat objects to contiguous buffer
+
+    :param objs: objects to pack
+    :param as_class: flat class
+    :return: bytes with packed records
+    """
+    layout = get_struct_layout(as_class)
+    pack_struct, values = layout.struct.pack, layout.values
+    try:
+        return b''.join([pack_struct(*values(o)) for o in objs])
+    except (struct.error, AttributeError) as e:
+        raise SerializationError('Cannot pack objects as {}: {}'.format(as_class, e))
+
+
+def iter_unpack(buffer, as_class: Type[T]) -> Iterator[T]:
+    """
+    Lazily unpack objects from contiguous buffer created by :func:`pack_many`
+
+    :param buffer: bytes-like object, its size must be multiple of record size
+    :param as_class: flat class
+    :return: iterator over instances of as_class
+    """
+    layout = get_struct_layout(as_class)
+    if len(memoryview(buffer).cast('B')) % layout.size != 0:
+        raise DeserializationError('Buffer size is not multiple of {} record size {}'.format(as_class, layout.size))
+    make = layout.make
+    return (make(values) for values in layout.struct.iter_unpack(buffer))
@@ -1,22 +1,32 @@
 from typing import Any, Hashable, List, Set, Tuple, Type
 
-from pyjackson.core import BUILTIN_TYPES, FIELD_MAPPING_NAME_FIELD, Position
+from pyjackson.core import BUILTIN_TYPES, FIELD_MAPPING_NAME_FIELD, GENERATED_CODECS, SCALAR_TYPES, Position
 from pyjackson.errors import SerializationError, UnserializableError
 from pyjackson.generics import SERIALIZER_MAPPING, Serializer, SerializerType, StaticSerializer
-from pyjackson.utils import (get_class_fields, get_type_field_name, has_serializer, is_aslist, is_serializable,
-                             is_union, issubclass_safe, type_field_position_is, union_args)
+from pyjackson.utils import (get_class_fields, get_class_fields_getter, get_type_field_name, has_serializer, is_aslist,
+                             is_namedtuple, is_serializable, is_union, issubclass_safe, type_field_position_is,
+                             union_args)
+
+
+def _is_plain_scalar(obj, as_class):
+    """Whether serialize(obj, as_class) would return obj as is"""
+    return type(obj) is as_class and as_class in SCALAR_TYPES and as_class not in SERIALIZER_MAPPING
+
+
+def _serialize_field(obj, as_class):
+    if _is_plain_scalar(obj, as_class):
+        return obj
+    return serialize(obj, as_class)
 
 
 def _serialize_to_dict(cls, obj):
     result = {}
     fields = get_class_fields(cls)
-    for f in fields:
-        name = f.name
-        field = getattr(obj, name)
+    mapping = getattr(cls, FIELD_MAPPING_NAME_FIELD, None)
+    for f, field in zip(fields, get_class_fields_getter(cls)(obj)):
         if field is not None:
-            if hasattr(cls, FIELD_MAPPING_NAME_FIELD):
-                name = getattr(cls, FIELD_MAPPING_NAME_FIELD).get(name, name)
-            result[name] = serialize(field, f.type)
+            name = f.name if mapping is None else mapping.get(f.name, f.name)
+            result[name] = _serialize_field(field, f.type)
 
     if type_field_position_is(cls, Position.INSIDE):
         type_field_name = get_type_field_name(cls)
@@ -29,10 +39,7 @@ def _serialize_to_dict(cls, obj):
 
 def _serialize_to_list(cls, obj):
     result = []
-    fields = get_class_fields(cls)
-    for f in fields:
-        name = f.name
-        field = getattr(obj, name)
+    for field in get_class_fields_getter(cls)(obj):
         if field is not None:
             result.append(serialize(field))
 
@@ -42,7 +49,15 @@ def _serialize_to_list(cls, obj):
     return result
 
 
+def _serialize_namedtuple(cls, obj):
+    # positional, like plain tuples, but with field types. None values are kept to preserve positions
+    return [_serialize_field(field, f.type) for f, field in zip(get_class_fields(cls), obj)]
+
+
 def _serialize_to(as_class, obj):
+    codec = GENERATED_CODECS.get(as_class)
+    if codec is not None:
+        return codec[0](obj)
     if is_aslist(as_class):
         return _serialize_to_list(as_class, obj)
     else:
@@ -70,7 +85,9 @@ def _serialize_with_serializer(obj, serializer: Serializer):
 
 
 def _serialize_as_type(obj, as_class: Type):
-    if any(isinstance(obj, t) for t in [List, Set, Tuple]):
+    if is_namedtuple(as_class):
+        return _serialize_namedtuple(as_class, obj)
+    elif any(isinstance(obj, t) for t in [List, Set, Tuple]):
         return [serialize(o) for o in obj]
     elif isinstance(obj, dict):
         return {key: serialize(value) for key, value in obj.items()}
@@ -0,0 +1,175 @@
+"""Persistent cache of class fields (see :func:`pyjackson.utils.get_class_fields`).
+
+Introspection of class `__init__` takes most of the time of short-living processes which deserialize few objects
+of many types. With spec cache enabled, computed fields are stored in file and loaded from it on the next start::
+
+    pyjackson.enable_spec_cache('~/.cache/myapp/pyjackson.cache')
+
+or set `PYJACKSON_SPEC_CACHE` environment variable to cache path. Entries are keyed by class module and qualname
+and are invalidated when source of any module of class MRO changes (by sha256 of module files, which are hashed
+once per process).
+Fields are stored with pickle, so classes which have fields of types that can not be pickled by reference
+(for example, parametrized serializers) or defaults that are not None, bool, int, float, str or bytes are not cached
+"""
+import atexit
+import hashlib
+import os
+import sys
+import threading
+from typing import List, Optional
+
+from pyjackson.core import Field
+
+__all__ = ['enable_spec_cache', 'disable_spec_cache', 'save_spec_cache', 'SPEC_CACHE_ENV']
+
+SPEC_CACHE_ENV = 'PYJACKSON_SPEC_CACHE'
+_VERSION = 2
+_DEFAULT_TYPES = (type(None), bool, int, float, str, bytes)
+
+_lock = threading.Lock()
+_path = None
+# (module, qualname) -> (fingerprint, pickled fields)
+_entries = {}
+_dirty = False
+_atexit_registered = False
+# module name -> sha256 of its source
+_source_hashes = {}
+
+
+def _header():
+    return _VERSION, sys.version_info[:2]
+
+
+def _source_hash(module_name: str) -> Optional[str]:
+    """sha256 of source file of module or None if module has no file"""
+    path = getattr(sys.modules.get(module_name), '__file__', None)
+    if path is None:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _mro_modules(cls) -> List[str]:
+    """Names of modules which define cls and its base classes (except builtins)"""
+    return list(dict.fromkeys(c.__module__ for c in cls.__mro__ if c.__module__ != 'builtins'))
+
+
+def _fingerprint(cls):
+    """Source hashes of modules of cls MRO or None if module of cls has no file"""
+    fingerprint = []
+    for name in _mro_modules(cls):
+        if name not in _source_hashes:
+            _source_hashes[name] = _source_hash(name)
+        fingerprint.append((name, _source_hashes[name]))
+    if _source_hashes.get(cls.__module__) is None:
+        return None
+    return tuple(fingerprint)
+
+
+def _key(cls):
+    qualname = getattr(cls, '__qualname__', None)
+    if qualname is None or '<locals>' in qualname:
+        return None, None
+    fingerprint = _fingerprint(cls)
+    if fingerprint is None:
+        return None, None
+    return (cls.__module__, qualname), fingerprint
+
+
+def get_cached_fields(cls: type) -> Optional[List[Field]]:
+    """Fields of cls from spec cache or None if spec cache is disabled or has no valid entry for cls"""
+    if _path is None:
+        return None
+    key, fingerprint = _key(cls)
+    entry = _entries.get(key)
+    if entry is None or entry[0] != fingerprint:
+        return None
+    import pickle  # imported only when cache is enabled, it is not needed for `import pyjackson`
+    try:
+        specs = pickle.loads(entry[1])
+    except Exception:
+        return None
+    return [Field(*spec) for spec in specs]
+
+
+def put_cached_fields(cls: type, fields: List[Field]):
+    """Store fields of cls to spec cache (if it is enabled and fields can be stored)"""
+    global _dirty
+    if _path is None:
+        return
+    key, fingerprint = _key(cls)
+    if key is None or not all(isinstance(f.default, _DEFAULT_TYPES) for f in fields):
+        return
+    import pickle
+    specs = [(f.name, f.type, f.has_default, f.default) for f in fields]
+    try:
+        data = pickle.dumps(specs, pickle.HIGHEST_PROTOCOL)
+        # types are pickled by name, check that names lead to the same objects
+        if pickle.loads(data) != specs:
+            return
+    except Exception:
+        return
+    with _lock:
+        _entries[key] = fingerprint, data
+        _dirty = True
+
+
+def enable_spec_cache(path: str):
+    """
+    Enable persistent spec cache and load its entries from `path` (if file exists).
+    Cache is saved to `path` at exit
+
+    :param path: path to cache file
+    """
+    global _path, _atexit_registered
+    import pickle
+    path = os.path.expanduser(path)
+    entries = {}
+    try:
+        with open(path, 'rb') as f:
+            header, loaded = pickle.load(f)
+        if header == _header():
+            entries = loaded
+    except Exception:
+        pass  # missing or corrupted cache is rebuilt
+    with _lock:
+        _path = path
+        _entries.clear()
+        _entries.update(entries)
+        _source_hashes.clear()
+        if not _atexit_registered:
+            atexit.register(save_spec_cache)
+            _atexit_registered = True
+
+
+def disable_spec_cache():
+    """Disable persistent spec cache without saving it"""
+    global _path, _dirty
+    with _lock:
+        _path = None
+        _dirty = False
+        _entries.clear()
+
+
+def save_spec_cache():
+    """Write spec cache to its file if new entries were added"""
+    global _dirty
+    with _lock:
+        if _path is None or not _dirty:
+            return
+        directory = os.path.dirname(_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        import pickle
+        tmp_path = '{}.{}.tmp'.format(_path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((_header(), _entries), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, _path)
+        _dirty = False
+
+
+if os.environ.get(SPEC_CACHE_ENV):
+    enable_spec_cache(os.environ[SPEC_CACHE_ENV])
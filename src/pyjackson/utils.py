@@ -2,12 +2,14 @@ import inspect
 import typing
 from copy import copy
 from importlib import import_module
+from operator import attrgetter
 
 from pyjackson import generics
-from pyjackson.core import (BUILTIN_TYPES, CLASS_SPECS_CACHE, TYPE_AS_LIST, TYPE_FIELD_NAME_FIELD_NAME,
-                            TYPE_FIELD_NAME_FIELD_POSITION, TYPE_FIELD_NAME_FIELD_ROOT, Comparable, Field, Position,
-                            Signature, Unserializable)
+from pyjackson.core import (BUILTIN_TYPES, CLASS_GETTERS_CACHE, CLASS_SPECS_CACHE, TYPE_AS_LIST,
+                            TYPE_FIELD_NAME_FIELD_NAME, TYPE_FIELD_NAME_FIELD_POSITION, TYPE_FIELD_NAME_FIELD_ROOT,
+                            Comparable, Field, Position, Signature, Unserializable)
 from pyjackson.errors import DeserializationError, PyjacksonError
+from pyjackson.spec_cache import get_cached_fields, put_cached_fields
 
 from ._typing_utils import (get_collection_type, get_generic_origin, is_collection, is_generic, is_generic_or_union,
                             is_mapping, is_tuple, is_union, resolve_inner_forward_refs)
@@ -19,7 +21,8 @@ __all__ = ['resolve_inner_forward_refs', 'is_generic', 'is_mapping', 'is_union',
            'turn_args_to_kwargs', 'has_subtype_alias', 'has_hierarchy', 'issubclass_safe', 'is_descriptor',
            'has_serializer', 'is_init_type_hinted_and_has_correct_attrs', 'is_serializable', 'is_hierarchy_root',
            'type_field_position_is', 'resolve_subtype', 'Comparable', 'get_tuple_internal_types', 'is_tuple',
-           'is_init_type_hinted', 'get_generic_origin', 'is_generic_or_union']
+           'is_init_type_hinted', 'get_generic_origin', 'is_generic_or_union', 'is_namedtuple', 'is_dataclass',
+           'get_class_fields_getter']
 
 
 def flat_dict_repr(d: dict, func_order=None, sep=',', braces=False):
@@ -115,26 +118,115 @@ def turn_args_to_kwargs(func, args, kwargs, skip_first=False):
     return kwargs
 
 
+def is_namedtuple(cls) -> bool:
+    """
+    Checks if cls is a type hinted named tuple (declared with :class:`typing.NamedTuple`)
+
+    :param cls: type to check
+    :return: boolean
+    """
+    if not (issubclass_safe(cls, tuple) and hasattr(cls, '_fields') and hasattr(cls, '_make')):
+        return False
+    # subclasses of typed named tuple have annotations only in their base
+    return any('__annotations__' in base.__dict__ for base in cls.__mro__)
+
+
+def is_dataclass(cls) -> bool:
+    """
+    Checks if cls is a dataclass type (declared with :func:`dataclasses.dataclass`)
+
+    :param cls: type to check
+    :return: boolean
+    """
+    return isinstance(cls, type) and '__dataclass_fields__' in cls.__dict__
+
+
+def _has_dataclass_init(cls) -> bool:
+    """Whether cls is a dataclass with `__init__` generated from its fields"""
+    return is_dataclass(cls) and cls.__dataclass_params__.init
+
+
+def _namedtuple_fields(cls) -> typing.List[Field]:
+    hints = typing.get_type_hints(cls)
+    defaults = getattr(cls, '_field_defaults', {})
+    fields = []
+    for name in cls._fields:
+        if name not in hints:
+            raise PyjacksonError('fields must be typehinted for named tuple {}'.format(cls))
+        has_default = name in defaults
+        fields.append(Field(name, hints[name], has_default, defaults.get(name)))
+    return fields
+
+
+def _dataclass_fields(cls) -> typing.List[Field]:
+    import dataclasses
+    hints = typing.get_type_hints(cls)
+    fields = []
+    # dataclasses.fields does not return InitVar pseudo-fields, but they are __init__ arguments too
+    for name in list(inspect.signature(cls.__init__).parameters)[1:]:
+        f = cls.__dataclass_fields__[name]
+        type_hint = hints.get(f.name)
+        if isinstance(type_hint, dataclasses.InitVar):
+            type_hint = type_hint.type
+        type_hint = resolve_inner_forward_refs(type_hint, cls.__init__)
+        has_default = f.default is not dataclasses.MISSING or f.default_factory is not dataclasses.MISSING
+        default = f.default if f.default is not dataclasses.MISSING else None
+        fields.append(Field(f.name, type_hint, has_default, default))
+    return fields
+
+
+def _introspect_class_fields(cls: type) -> typing.List[Field]:
+    if is_namedtuple(cls):
+        return _namedtuple_fields(cls)
+    elif _has_dataclass_init(cls):
+        return _dataclass_fields(cls)
+    spec = inspect.getfullargspec(cls.__init__)
+    arguments = spec.args[1:]
+    defaults = spec.defaults
+    hints = typing.get_type_hints(cls.__init__)
+    return _argspec_to_fields(cls.__init__, arguments, defaults, hints)
+
+
 def get_class_fields(cls: type) -> typing.List[Field]:
     """Cache and return class's __init__ parameter names and type hint"""
     if cls not in CLASS_SPECS_CACHE:
-
-        if hasattr(cls, '_field_types') and hasattr(cls, '_fields'):
-            # NamedTuple case
-            hints = cls._field_types
-            arguments = cls._fields
-            defaults = tuple()
-        else:
-            spec = inspect.getfullargspec(cls.__init__)
-            arguments = spec.args[1:]
-            defaults = spec.defaults
-            hints = typing.get_type_hints(cls.__init__)
-
-        fields = _argspec_to_fields(cls.__init__, arguments, defaults, hints)
+        fields = get_cached_fields(cls)
+        if fields is None:
+            fields = _introspect_class_fields(cls)
+            put_cached_fields(cls, fields)
         CLASS_SPECS_CACHE[cls] = fields
     return CLASS_SPECS_CACHE[cls]
 
 
+def _no_fields_getter(obj):
+    return ()
+
+
+def get_class_fields_getter(cls: type) -> typing.Callable[[typing.Any], tuple]:
+    """
+    Cache and return function which gets values of all class fields (see :func:`get_class_fields`)
+    from instance at once. Works with __slots__ classes as well
+
+    :param cls: class
+    :return: function which returns tuple of field values for instance of cls
+    """
+    getter = CLASS_GETTERS_CACHE.get(cls)
+    if getter is None:
+        names = [f.name for f in get_class_fields(cls)]
+        if len(names) == 0:
+            getter = _no_fields_getter
+        elif len(names) == 1:
+            # attrgetter with single attribute returns value, not tuple
+            single_getter = attrgetter(names[0])
+
+            def getter(obj):
+                return single_getter(obj),
+        else:
+            getter = attrgetter(*names)
+        CLASS_GETTERS_CACHE[cls] = getter
+    return getter
+
+
 def get_class_field_names(cls: type) -> typing.List[str]:
     """
     Get class field names, which must be list of `__init__` arguments
@@ -142,6 +234,8 @@ def get_class_field_names(cls: type) -> typing.List[str]:
     :param cls: class
     :return: list of field names
     """
+    if is_namedtuple(cls) or is_dataclass(cls):
+        return [f.name for f in get_class_fields(cls)]
     return list(inspect.getfullargspec(cls.__init__).args[1:])
 
 
@@ -228,7 +322,7 @@ def is_descriptor(obj):
 
 def has_serializer(as_class: typing.Type):
     return isinstance(as_class, typing.Hashable) and \
-           as_class in generics.SERIALIZER_MAPPING and \
+           generics._resolve_serializer(as_class) is not None and \
            not isinstance(as_class, generics.Serializer)
 
 
@@ -242,8 +336,9 @@ def is_init_type_hinted(cls):
 
 def is_init_type_hinted_and_has_correct_attrs(obj):
     try:
-        return all(hasattr(obj, a.name) for a in get_class_fields(type(obj)))
-    except PyjacksonError:
+        get_class_fields_getter(type(obj))(obj)
+        return True
+    except (PyjacksonError, AttributeError):
         return False
 
 
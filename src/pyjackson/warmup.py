@@ -0,0 +1,111 @@
+"""Eager warmup of pyjackson caches.
+
+First (de)serialization of each type introspects its `__init__` (:func:`inspect.getfullargspec`,
+:func:`typing.get_type_hints`, forward references resolution) and creates serializers for subclasses
+of registered base types (for example, `EnumSerializer(MyEnum)`). :func:`prepare` does all of this up front,
+so first requests after start are as fast as the following ones::
+
+    pyjackson.prepare(MyRequest, MyResponse)  # or background=True to not block import
+
+In pre-forking servers use :func:`prefork_warmup` in master process, so workers inherit ready caches
+"""
+import gc
+import threading
+
+from pyjackson.core import BUILTIN_TYPES
+from pyjackson.generics import SERIALIZER_MAPPING, Serializer
+from pyjackson.utils import (get_class_fields, get_class_fields_getter, has_hierarchy, has_serializer,
+                             is_generic_or_union, issubclass_safe)
+
+__all__ = ['prepare', 'prefork_warmup']
+
+
+def _is_type(tp) -> bool:
+    return isinstance(tp, type) or is_generic_or_union(tp)
+
+
+def _type_args(tp) -> list:
+    """Types inside generic, union or parametrized serializer"""
+    if issubclass_safe(tp, Serializer):
+        if not tp._is_dynamic:
+            return []
+        # serializer arguments are not only types, eg `by_name` flag of EnumSerializer
+        args = [getattr(tp, name) for name in tp._fields]
+    else:
+        args = getattr(tp, '__args__', None) or ()
+    return [a for a in args if _is_type(a)]
+
+
+def _prepare_type(tp) -> list:
+    """Fill caches for one type
+
+    :return: types referenced by tp
+    """
+    if is_generic_or_union(tp) or issubclass_safe(tp, Serializer):
+        return _type_args(tp)
+    if has_serializer(tp):
+        # creates serializer if it is registered for base class
+        return [SERIALIZER_MAPPING[tp]]
+    if not isinstance(tp, type) or tp in BUILTIN_TYPES:
+        return []
+
+    fields = get_class_fields(tp)
+    get_class_fields_getter(tp)
+    refs = [f.type for f in fields]
+    if has_hierarchy(tp):
+        refs += [t for t in tp._subtypes.values() if issubclass_safe(t, tp)]
+    return refs
+
+
+def _prepare(types, recursive: bool) -> list:
+    prepared = []
+    seen = set()
+    queue = list(types)
+    while queue:
+        tp = queue.pop()
+        try:
+            if tp in seen:
+                continue
+            seen.add(tp)
+        except TypeError:
+            pass  # unhashable serializer or generic, may be visited twice
+        refs = _prepare_type(tp)
+        if isinstance(tp, type):
+            prepared.append(tp)
+        if recursive:
+            queue.extend(refs)
+    return prepared
+
+
+def prepare(*types, recursive: bool = True, background: bool = False):
+    """
+    Precompute everything pyjackson needs to (de)serialize `types`: class fields, field getters and
+    serializers for subclasses of registered types. Call it at startup to avoid latency spikes on first requests
+
+    :param types: types or serializers
+    :param recursive: also prepare types of fields, generic arguments and registered subtypes of hierarchies
+    :param background: prepare in daemon thread and return immediately
+    :return: list of prepared types or started :class:`threading.Thread` if `background` is True
+    :raise: PyjacksonError if some of the types can not be serialized
+    """
+    if background:
+        thread = threading.Thread(target=_prepare, args=(types, recursive), name='pyjackson-prepare', daemon=True)
+        thread.start()
+        return thread
+    return _prepare(types, recursive)
+
+
+def prefork_warmup(*types, recursive: bool = True) -> list:
+    """
+    Prepare `types` (see :func:`prepare`) in master process of pre-forking server and call :func:`gc.freeze`
+    (python 3.7+), so that forked workers inherit filled caches and GC in workers does not touch
+    (and copy) memory pages with objects created before fork. Call it right before forking workers
+
+    :param types: types or serializers
+    :param recursive: also prepare types of fields, generic arguments and registered subtypes of hierarchies
+    :return: list of prepared types
+    """
+    prepared = prepare(*types, recursive=recursive)
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
+    return prepared
@@ -0,0 +1,121 @@
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import pytest
+
+from pyjackson import dumps, read, serialize, write
+from pyjackson.aio import adeserialize, adump_lines, aload_lines, aread, awrite
+from pyjackson.errors import DeserializationError
+from pyjackson.utils import Comparable
+from tests.test_helpers import LINES, OBJ_PAYLOAD, Payload
+
+
+class BufferWriter:
+    """StreamWriter-like object which stores written data"""
+
+    def __init__(self):
+        self.data = b''
+        self.drains = 0
+
+    def write(self, data: bytes):
+        self.data += data
+
+    async def drain(self):
+        self.drains += 1
+
+
+async def _load_lines(data: bytes, *args):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return [o async for o in aload_lines(reader, *args)]
+
+
+@pytest.fixture(params=['threads', 'processes'])
+def executor(request):
+    if request.param == 'threads':
+        yield None
+    else:
+        with ProcessPoolExecutor(1) as executor:
+            yield executor
+
+
+def test_aread_awrite(tmp_file, executor):
+    asyncio.run(awrite(tmp_file, OBJ_PAYLOAD, executor=executor))
+    assert read(tmp_file, Payload) == OBJ_PAYLOAD
+
+    write(tmp_file, OBJ_PAYLOAD)
+    assert asyncio.run(aread(tmp_file, Payload, executor=executor)) == OBJ_PAYLOAD
+
+
+@pytest.mark.parametrize('batch_size,prefetch', [(1, 1), (2, 2), (2, 4), (1000, 2)])
+def test_aload_lines(batch_size, prefetch, executor):
+    data = ''.join(dumps(o) + '\n\n' for o in LINES * 3).encode('utf8')
+    result = asyncio.run(_load_lines(data, Payload, executor, batch_size, prefetch))
+    assert result == LINES * 3
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1 << 16])
+def test_aload_lines_chunks(chunk_size):
+    # records longer than default StreamReader limit (64 KiB) and last record without newline
+    lines = [Payload('x' * 100000), Payload('a'), Payload('б' * 70000)]
+    data = '\n'.join(dumps(o) for o in lines).encode('utf8')
+    assert asyncio.run(_load_lines(data, Payload, None, 2, 2, chunk_size)) == lines
+
+
+def test_aload_lines_empty():
+    assert asyncio.run(_load_lines(b'', Payload)) == []
+
+
+@pytest.mark.parametrize('batch_size', [1, 2, 1000])
+def test_adump_lines(batch_size, executor):
+    writer = BufferWriter()
+    written = asyncio.run(adump_lines(writer, iter(LINES * 3), Payload, executor, batch_size))
+    assert written == len(writer.data)
+    assert writer.drains == -(-9 // batch_size)
+    assert [json.loads(line) for line in writer.data.splitlines()] == [{'field': o.field} for o in LINES * 3]
+
+
+class Tree(Comparable):
+    def __init__(self, value: int, children: List['Tree'] = None):
+        self.value = value
+        self.children = children
+
+
+def _tree(depth):
+    return Tree(depth, [_tree(depth - 1) for _ in range(4)] if depth > 0 else None)
+
+
+async def _deserialize_with_ticker(payload, as_class, budget_ms):
+    ticks = 0
+    stop = False
+
+    async def ticker():
+        nonlocal ticks
+        while not stop:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    task = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)
+    result = await adeserialize(payload, as_class, budget_ms)
+    stop = True
+    await task
+    return result, ticks
+
+
+def test_adeserialize():
+    obj = _tree(6)
+    payload = serialize(obj)
+    result, ticks = asyncio.run(_deserialize_with_ticker(payload, Tree, budget_ms=0.1))
+    assert result == obj
+    assert ticks > 2
+
+    assert asyncio.run(adeserialize([{'field': 'a'}], List[Payload])) == [Payload('a')]
+
+
+def test_adeserialize_errors():
+    with pytest.raises(DeserializationError):
+        asyncio.run(adeserialize({'a': 1}, Dict[Tuple[int, int], int]))
@@ -1,9 +1,23 @@
+import array
+import base64
 import datetime
+import decimal
+import enum
 import uuid
+from typing import Dict, List, Optional
 
 import pytest
 
+from pyjackson import builtin_types, deserialize, utils
+from pyjackson.builtin_types import (ArraySerializer, BytesSerializer, ColumnarSerializer, DatetimeSerializer,
+                                     EnumSerializer, IsoDatetimeSerializer, MemoryviewSerializer,
+                                     TypecodeArraySerializer)
+from pyjackson.core import Position
+from pyjackson.decorators import rename_fields, type_field
+from pyjackson.errors import DeserializationError
+from pyjackson.generics import SERIALIZER_MAPPING
 from pyjackson.serialization import SerializationError, serialize
+from pyjackson.utils import Comparable
 from tests.conftest import serde_and_compare
 
 
@@ -34,3 +48,295 @@ def test_datetime_serializer(type_factory):
 
     bar = Foo(datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=-3))))
     serde_and_compare(bar, Foo)
+
+
+TIMEZONES = [None, datetime.timezone.utc, datetime.timezone(datetime.timedelta(hours=-3, minutes=-30)),
+             datetime.timezone(datetime.timedelta(hours=5, seconds=5))]
+
+
+@pytest.mark.parametrize('tz', TIMEZONES)
+def test_datetime_serializer__same_as_strftime(tz):
+    value = datetime.datetime(2021, 5, 6, 7, 8, 9, 10, tzinfo=tz)
+    payload = serialize(value)
+    assert payload == value.strftime(DatetimeSerializer.DT_FORMAT)
+    new_value = deserialize(payload, datetime.datetime)
+    assert new_value == value
+    assert new_value.utcoffset() == value.utcoffset()
+
+
+def test_datetime_serializer__not_canonical():
+    assert deserialize('2021-05-06 07:08:09.000010 +03:00', datetime.datetime) == \
+        datetime.datetime(2021, 5, 6, 7, 8, 9, 10, datetime.timezone(datetime.timedelta(hours=3)))
+
+
+@pytest.mark.parametrize('tz', TIMEZONES)
+def test_iso_datetime_serializer(tz, type_factory):
+    value = datetime.datetime(2021, 5, 6, 7, 8, 9, 10, tzinfo=tz)
+    Foo = type_factory('Foo', IsoDatetimeSerializer)
+    serde_and_compare(Foo(value), Foo, true_payload={'field': value.isoformat()})
+
+
+def test_iso_utc_offset_cache_is_bounded():
+    assert builtin_types._iso_utc_offset.cache_info().maxsize is not None
+
+
+@pytest.mark.parametrize('value', [
+    datetime.time(7, 8), datetime.time(7, 8, 9), datetime.time(7, 8, 9, 10),
+    *[datetime.time(7, 8, 9, 10, tzinfo=tz) for tz in TIMEZONES],
+    datetime.datetime(2021, 5, 6), *[datetime.datetime(2021, 5, 6, 7, 8, 9, 10, tzinfo=tz) for tz in TIMEZONES],
+])
+def test_iso_parsers_fallback(value):
+    # used instead of fromisoformat on python < 3.7
+    payload = value.isoformat()
+    if isinstance(value, datetime.datetime):
+        assert builtin_types._parse_iso_datetime(payload) == value
+        assert builtin_types._parse_iso_date(payload[:10]) == value.date()
+    else:
+        assert builtin_types._parse_iso_time(payload) == value
+        assert builtin_types._parse_iso_time(value.isoformat('minutes')) == value.replace(second=0, microsecond=0)
+
+
+@pytest.mark.parametrize('field_type,value,payload', [
+    (datetime.date, datetime.date(2021, 5, 6), '2021-05-06'),
+    (datetime.time, datetime.time(7, 8, 9, 10), '07:08:09.000010'),
+    (datetime.time, datetime.time(7, 8, tzinfo=datetime.timezone.utc), '07:08:00+00:00'),
+    (datetime.timedelta, datetime.timedelta(days=1, microseconds=1), 86400.000001),
+    (datetime.timedelta, datetime.timedelta(seconds=-1), -1.),
+    (decimal.Decimal, decimal.Decimal('1.10'), '1.10'),
+])
+def test_builtin_serializers(field_type, value, payload, type_factory):
+    Foo = type_factory('Foo', field_type)
+    serde_and_compare(Foo(value), Foo, true_payload={'field': payload})
+
+
+class Color(enum.Enum):
+    RED = 'red'
+    GREEN = 'green'
+    LIME = 'green'
+
+
+class Size(enum.IntEnum):
+    SMALL = 1
+    BIG = 2
+
+
+class Permission(enum.IntFlag):
+    READ = 1
+    WRITE = 2
+
+
+def test_enum(type_factory):
+    Foo = type_factory('Foo', Color)
+    serde_and_compare(Foo(Color.RED), Foo, true_payload={'field': 'red'})
+    serde_and_compare([Color.GREEN, Color.RED], List[Color], true_payload=['green', 'red'])
+    assert deserialize('green', Color) is Color.LIME
+    assert SERIALIZER_MAPPING[Color] is EnumSerializer(Color)
+
+
+def test_enum_serializer_arguments_cached(monkeypatch):
+    EnumSerializer(Color)
+    # __init__ of serializer is not introspected on every instantiation
+    monkeypatch.setattr(utils, 'get_function_fields', None)
+    assert EnumSerializer(Color, by_name=False) is EnumSerializer(Color)
+    monkeypatch.undo()
+    assert EnumSerializer(Color, True).by_name
+
+
+def test_enum_int(type_factory):
+    Foo = type_factory('Foo', Dict[str, Size])
+    serde_and_compare(Foo({'a': Size.BIG}), Foo, true_payload={'field': {'a': 2}})
+    serde_and_compare(Permission.READ | Permission.WRITE, Permission, true_payload=3)
+
+
+def test_enum_unknown_value():
+    with pytest.raises(ValueError):
+        deserialize('blue', Color)
+
+
+def test_enum_by_name(type_factory):
+    as_class = EnumSerializer(Color, by_name=True)
+    Foo = type_factory('Foo', as_class)
+    serde_and_compare(Foo(Color.GREEN), Foo, true_payload={'field': 'GREEN'})
+    assert deserialize('LIME', as_class) is Color.GREEN
+
+    with pytest.raises(DeserializationError):
+        deserialize('BLUE', as_class)
+
+
+@pytest.mark.parametrize('as_class,value,payload', [
+    (ArraySerializer('d'), array.array('d', [1.5, 2.]), [1.5, 2.]),
+    (ArraySerializer('i'), array.array('i', [1, -2]), [1, -2]),
+    (ArraySerializer('H', packed=True), array.array('H', [1, 2]), 'AQACAA=='),
+    (ArraySerializer('d', packed=True), array.array('d'), ''),
+])
+def test_array(as_class, value, payload, type_factory):
+    Foo = type_factory('Foo', as_class)
+    serde_and_compare(Foo(value), Foo, true_payload={'field': payload})
+
+
+def test_array_from_other_formats():
+    assert serialize([1, 2], ArraySerializer('i', packed=True)) == 'AQAAAAIAAAA='
+    assert serialize(array.array('i', [1, 2]), ArraySerializer('d')) == [1., 2.]
+    assert deserialize('AQACAA==', ArraySerializer('H')) == array.array('H', [1, 2])
+    assert deserialize([1, 2], ArraySerializer('H', packed=True)) == array.array('H', [1, 2])
+
+
+def test_array_default():
+    value = array.array('d', [1., 2.5])
+    payload = {'typecode': 'd', 'items': [1., 2.5]}
+    assert serialize(value) == payload
+    assert serialize(value, array.array) == payload
+    new_value = deserialize(payload, array.array)
+    assert new_value == value
+    assert new_value.typecode == 'd'
+    # parametrized ArraySerializer is not registered as default
+    ArraySerializer('i')
+    assert SERIALIZER_MAPPING[array.array] is TypecodeArraySerializer
+
+
+@pytest.mark.parametrize('payload,as_class', [
+    ('AQAC', ArraySerializer('H')),
+    ([1, 'a'], ArraySerializer('H')),
+    ({'typecode': 'H', 'items': [1, 2]}, ArraySerializer('H')),
+    ({'typecode': 'Z', 'items': [1, 2]}, array.array),
+    ({'typecode': 'H', 'items': [-1]}, array.array),
+    ({'items': [1, 2]}, array.array),
+])
+def test_array_bad_payload(payload, as_class):
+    with pytest.raises(DeserializationError):
+        deserialize(payload, as_class)
+
+
+@pytest.mark.parametrize('as_class,value', [
+    (bytes, b'\x00\xffabc'),
+    (bytes, b''),
+    (bytearray, bytearray(b'\x00\xffabc')),
+    (memoryview, memoryview(b'\x00\xffabc')),
+])
+def test_binary(as_class, value, type_factory):
+    Foo = type_factory('Foo', as_class)
+    serde_and_compare(Foo(value), Foo, true_payload={'field': base64.b64encode(value).decode()})
+
+
+def test_binary_buffers():
+    assert serialize(memoryview(b'abcd')[::2]) == 'YWM='
+    assert serialize(bytearray(b'ab'), BytesSerializer) == 'YWI='
+    assert serialize(array.array('B', b'ab'), BytesSerializer) == 'YWI='
+
+    view = deserialize('YWJj', memoryview)
+    assert isinstance(view, memoryview)
+    assert view.readonly
+    assert view == b'abc'
+    assert isinstance(deserialize('YWJj', bytearray), bytearray)
+
+
+def test_final_real_type():
+    assert SERIALIZER_MAPPING[memoryview] is MemoryviewSerializer
+    assert isinstance(memoryview(b''), MemoryviewSerializer)
+    assert issubclass(memoryview, MemoryviewSerializer)
+
+
+@rename_fields(value='val')
+class Record(Comparable):
+    def __init__(self, name: str, value: float, when: datetime.date = None, tags: List[str] = None, count: int = 1):
+        self.name = name
+        self.value = value
+        self.when = when
+        self.tags = tags
+        self.count = count
+
+
+def test_columnar(type_factory):
+    Foo = type_factory('Foo', ColumnarSerializer(Record))
+    obj = Foo([Record('a', 1.5, datetime.date(2020, 1, 2), ['x']), Record('b', 2., count=2)])
+    serde_and_compare(obj, Foo, true_payload={'field': {
+        'name': ['a', 'b'], 'val': [1.5, 2.], 'when': ['2020-01-02', None], 'tags': [['x'], None], 'count': [1, 2]
+    }})
+    serde_and_compare(Foo([]), Foo, true_payload={'field': {'name': [], 'val': [], 'when': [], 'tags': [],
+                                                            'count': []}})
+
+
+def test_columnar_deserialize():
+    as_class = ColumnarSerializer(Record)
+    assert deserialize({'name': ['a', 'b'], 'val': [1, 2.], 'count': [None, 3]}, as_class) == [
+        Record('a', 1, count=1), Record('b', 2., count=3)]
+    assert deserialize([{'name': 'a', 'val': 1.}], as_class) == [Record('a', 1.)]
+
+    with pytest.raises(DeserializationError):
+        deserialize({'name': ['a']}, as_class)
+    with pytest.raises(DeserializationError):
+        deserialize({'name': ['a'], 'val': [1., 2.]}, as_class)
+
+
+def test_columnar_wrong_type():
+    with pytest.raises(SerializationError):
+        serialize(['a'], ColumnarSerializer(Record))
+
+
+def test_columnar_no_fields():
+    class Empty:
+        pass
+
+    with pytest.raises(SerializationError):
+        serialize([Empty(), Empty()], ColumnarSerializer(Empty))
+    with pytest.raises(DeserializationError):
+        deserialize({}, ColumnarSerializer(Empty))
+
+
+@type_field('kind', Position.OUTSIDE)
+class Payload(Comparable):
+    pass
+
+
+class TextPayload(Payload):
+    kind = 'text'
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class NumberPayload(Payload):
+    kind = 'number'
+
+    def __init__(self, value: int):
+        self.value = value
+
+
+class Message(Comparable):
+    def __init__(self, kind: str, payload: Payload):
+        self.kind = kind
+        self.payload = payload
+
+
+def test_columnar_outside_type_field():
+    as_class = ColumnarSerializer(Message)
+    value = [Message('text', TextPayload('a')), Message('number', NumberPayload(1))]
+    payload = {'kind': ['text', 'number'], 'payload': [{'text': 'a'}, {'value': 1}]}
+    assert serialize(value, as_class) == payload
+    assert deserialize(payload, as_class) == value
+    assert deserialize([serialize(v) for v in value], as_class) == value
+
+    with pytest.raises(DeserializationError):
+        deserialize({'payload': [{'text': 'a'}]}, as_class)
+
+
+class ColumnNode(Comparable):
+    def __init__(self, name: str, leaf: Optional['ColumnLeaf'] = None):
+        self.name = name
+        self.leaf = leaf
+
+
+class ColumnTree(Comparable):
+    # item type has forward reference to type which is not declared yet
+    def __init__(self, nodes: ColumnarSerializer(ColumnNode)):
+        self.nodes = nodes
+
+
+class ColumnLeaf(Comparable):
+    def __init__(self, value: int):
+        self.value = value
+
+
+def test_columnar_forward_ref():
+    serde_and_compare(ColumnTree([ColumnNode('a', ColumnLeaf(1)), ColumnNode('b')]), ColumnTree,
+                      true_payload={'nodes': {'name': ['a', 'b'], 'leaf': [{'value': 1}, None]}})
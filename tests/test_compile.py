@@ -0,0 +1,205 @@
+import datetime
+import importlib.util
+import os
+import sys
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import pytest
+
+import pyjackson
+from pyjackson import compile, spec_cache, utils
+from pyjackson.builtin_types import ColumnarSerializer
+from pyjackson.core import CLASS_GETTERS_CACHE, CLASS_SPECS_CACHE, GENERATED_CODECS, Position
+from pyjackson.decorators import as_list, rename_fields, type_field
+from pyjackson.errors import SerializationError
+from pyjackson.utils import Comparable
+
+DEFAULT_TAGS = ['default']
+OTHER_TAGS = ['other']
+
+
+class Color(Enum):
+    RED = 'red'
+
+
+class Item(Comparable):
+    def __init__(self, name: str, price: float, count: int = 1, tags: List[str] = DEFAULT_TAGS):
+        self.name = name
+        self.price = price
+        self.count = count
+        self.tags = tags
+
+
+@rename_fields(created='createdAt')
+class Order(Comparable):
+    def __init__(self, items: Dict[str, List[Item]], created: datetime.datetime, color: Color,
+                 rows: ColumnarSerializer(Item), parent: Optional['Order'] = None, pair: Tuple[int, ...] = ()):
+        self.items = items
+        self.created = created
+        self.color = color
+        self.rows = rows
+        self.parent = parent
+        self.pair = pair
+
+
+@type_field('kind')
+class Shape(Comparable):
+    kind = None
+
+
+class Circle(Shape):
+    kind = 'circle'
+
+    def __init__(self, radius: float):
+        self.radius = radius
+
+
+@as_list
+class Square(Shape):
+    kind = 'square'
+
+    def __init__(self, side: int, color: Color = Color.RED):
+        self.side = side
+        self.color = color
+
+
+class Labeled(Shape):
+    kind = 'labeled'
+
+    def __init__(self, label: str, kind: str = None):
+        self.label = label
+        self.kind = kind
+
+
+@type_field('kind', Position.OUTSIDE)
+class Content(Comparable):
+    pass
+
+
+class Text(Content):
+    kind = 'text'
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class Block(Comparable):
+    def __init__(self, kind: str, content: Content, shapes: List[Shape]):
+        self.kind = kind
+        self.content = content
+        self.shapes = shapes
+
+
+@dataclass
+class Config:
+    name: str
+    blocks: List[Block] = field(default_factory=list)
+    order: Optional[Order] = None
+
+
+class Tagged(Comparable):
+    def __init__(self, name: str, tags: List[str] = DEFAULT_TAGS, *, labels: List[str] = OTHER_TAGS):
+        self.name = name
+        self.tags = tags
+        self.labels = labels
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+COMPILED = [Item, Order, Shape, Circle, Square, Labeled, Content, Text, Block, Config, Tagged]
+
+ORDER = Order({'a': [Item('x', 1.5), Item('y', 2, 3, ['t'])]}, datetime.datetime(2020, 1, 2), Color.RED,
+              [Item('z', 0.5)], Order({}, datetime.datetime(2021, 1, 1), Color.RED, [], pair=(1, 2)))
+CONFIG = Config('c', [Block('text', Text('hello'), [Circle(1.)])], ORDER)
+
+
+@pytest.fixture
+def codecs_module(tmpdir):
+    source = compile.generate_codecs(__name__)
+    path = os.path.join(tmpdir, 'test_codecs.py')
+    with open(path, 'w') as f:
+        f.write(source)
+
+    def load():
+        spec = importlib.util.spec_from_file_location('test_codecs', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    yield load
+    for cls in COMPILED:
+        GENERATED_CODECS.pop(cls, None)
+        CLASS_SPECS_CACHE.pop(cls, None)
+        CLASS_GETTERS_CACHE.pop(cls, None)
+
+
+def test_generate_codecs(codecs_module, monkeypatch):
+    expected_fields = {cls: utils.get_class_fields(cls) for cls in COMPILED}
+    expected = pyjackson.serialize(CONFIG)
+    assert expected['blocks'][0]['shapes'] == [{'radius': 1., 'kind': 'circle'}]
+
+    for cls in COMPILED:
+        CLASS_SPECS_CACHE.pop(cls)
+        CLASS_GETTERS_CACHE.pop(cls, None)
+    module = codecs_module()
+    assert set(module.CODECS) == set(COMPILED)
+    assert module.FIELDS == expected_fields
+    assert module.FIELDS[Item][3].default is DEFAULT_TAGS
+    assert module.FIELDS[Tagged][1].default is DEFAULT_TAGS
+
+    def fail(cls):
+        raise AssertionError('{} was introspected'.format(cls))
+
+    monkeypatch.setattr(utils, '_introspect_class_fields', fail)
+    assert pyjackson.serialize(CONFIG) == expected
+    assert pyjackson.deserialize(expected, Config) == CONFIG
+    assert pyjackson.serialize(Square(3)) == ['square', 3, 'red']
+    assert pyjackson.deserialize(['square', 3], Square) == Square(3)
+
+
+def test_generated_codecs_errors(codecs_module):
+    codecs_module()
+    with pytest.raises(ValueError):
+        pyjackson.deserialize({'price': 1}, Item)
+    with pytest.raises(ValueError):
+        pyjackson.deserialize(['square'], Square)
+    assert pyjackson.serialize(Labeled('a')) == {'label': 'a', 'kind': 'labeled'}
+    with pytest.raises(SerializationError):
+        pyjackson.serialize(Labeled('a', 'b'))
+
+
+def test_skipped():
+    source = compile.generate_codecs(sys.modules[__name__])
+    assert '# skipped {}.Point: named tuples are not supported'.format(__name__) in source
+    assert '# skipped {}.Color: has serializer'.format(__name__) in source
+
+
+def test_outdated_sources():
+    with pytest.warns(UserWarning):
+        assert not compile.register_codecs({__name__: 'outdated'}, {}, {Item: (None, None)})
+    assert Item not in GENERATED_CODECS
+
+
+def test_base_class_sources(codecs_module):
+    # Comparable, base class of compiled classes, is defined in pyjackson.core
+    module = codecs_module()
+    assert module.SOURCES['pyjackson.core'] == spec_cache._source_hash('pyjackson.core')
+    assert module.SOURCES[__name__] == spec_cache._source_hash(__name__)
+
+
+def test_load_codecs():
+    assert not compile.load_codecs('tests.no_such_codecs')
+
+
+def test_main(tmpdir, capsys):
+    path = os.path.join(tmpdir, 'codecs.py')
+    compile.main([__name__, '-o', path])
+    with open(path) as f:
+        assert f.read() == compile.generate_codecs(__name__)
+    compile.main([__name__])
+    assert capsys.readouterr().out == compile.generate_codecs(__name__)
@@ -0,0 +1,169 @@
+import dataclasses
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+import pytest
+
+from pyjackson import deserialize, iterative, serialize
+from pyjackson.core import Field
+from pyjackson.decorators import camel_case
+from pyjackson.utils import get_class_field_names, get_class_fields, is_dataclass, is_namedtuple
+from tests.conftest import serde_and_compare
+
+
+class Point(NamedTuple):
+    x: int
+    y: float
+    label: Optional[str] = None
+
+
+class Point3D(Point):
+    def norm(self) -> float:
+        return abs(self.x) + abs(self.y)
+
+
+class Polygon(NamedTuple):
+    points: List[Point]
+    name: str = 'polygon'
+
+
+@dataclasses.dataclass
+class Item:
+    name: str
+    point: Point
+    tags: List[str] = dataclasses.field(default_factory=list)
+    count: int = 1
+    computed: int = dataclasses.field(init=False, default=0)
+
+
+@dataclasses.dataclass(frozen=True)
+class Frozen:
+    value: int
+    items: Dict[str, Item]
+
+
+@dataclasses.dataclass
+class Scaled:
+    value: int
+    scale: dataclasses.InitVar[int] = 1
+
+    def __post_init__(self, scale):
+        self.value *= scale
+
+
+@dataclasses.dataclass(init=False)
+class CustomInit:
+    total: int
+
+    def __init__(self, a: int, b: int = 0):
+        self.a = a
+        self.b = b
+        self.total = a + b
+
+
+@camel_case
+@dataclasses.dataclass
+class CamelData:
+    field_name: str
+
+
+def test_is_namedtuple():
+    assert is_namedtuple(Point)
+    assert is_namedtuple(Point3D)
+    assert not is_namedtuple(tuple)
+    assert not is_namedtuple(Item)
+    assert not is_namedtuple(Point(1, 2.))
+
+
+def test_is_dataclass():
+    assert is_dataclass(Item)
+    assert is_dataclass(Frozen)
+    assert not is_dataclass(Point)
+    assert not is_dataclass(Item('a', Point(1, 1.)))
+
+
+def test_namedtuple_fields():
+    assert get_class_fields(Point) == [Field('x', int, False), Field('y', float, False),
+                                       Field('label', Optional[str], True, None)]
+    assert get_class_field_names(Polygon) == ['points', 'name']
+
+
+def test_dataclass_fields():
+    assert get_class_fields(Item) == [Field('name', str, False), Field('point', Point, False),
+                                      Field('tags', List[str], True, None), Field('count', int, True, 1)]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason='InitVar type is available since python 3.8')
+def test_dataclass_init_var():
+    assert get_class_fields(Scaled) == [Field('value', int, False), Field('scale', int, True, 1)]
+    assert deserialize({'value': 2, 'scale': 3}, Scaled) == Scaled(6)
+    assert deserialize({'value': 2}, Scaled) == Scaled(2)
+
+
+def test_dataclass_custom_init():
+    assert get_class_fields(CustomInit) == [Field('a', int, False), Field('b', int, True, 0)]
+    assert get_class_field_names(CustomInit) == ['a', 'b']
+    serde_and_compare(CustomInit(a=3), true_payload={'a': 3, 'b': 0})
+
+
+def test_namedtuple():
+    serde_and_compare(Point(1, 2.5), true_payload=[1, 2.5, None])
+    serde_and_compare(Point(1, 2.5, 'a'), true_payload=[1, 2.5, 'a'])
+
+
+def test_namedtuple_subclass():
+    serde_and_compare(Point3D(1, 2.5), true_payload=[1, 2.5, None])
+    assert get_class_fields(Point3D) == get_class_fields(Point)
+
+
+def test_namedtuple_defaults():
+    assert deserialize([1, 2.5], Point) == Point(1, 2.5)
+    with pytest.raises(ValueError):
+        deserialize([1], Point)
+
+
+def test_namedtuple_from_dict():
+    assert deserialize({'x': 1, 'y': 2.}, Point) == Point(1, 2.)
+
+
+def test_nested_namedtuple():
+    obj = Polygon([Point(0, 0.), Point(1, 1., 'b')])
+    serde_and_compare(obj, true_payload=[[[0, 0., None], [1, 1., 'b']], 'polygon'])
+
+
+def test_dataclass():
+    obj = Item('a', Point(1, 1.), ['b'])
+    serde_and_compare(obj, true_payload={'name': 'a', 'point': [1, 1., None], 'tags': ['b'], 'count': 1})
+
+    assert deserialize({'name': 'a', 'point': [1, 1.]}, Item) == Item('a', Point(1, 1.))
+
+
+def test_frozen_dataclass():
+    obj = Frozen(1, {'a': Item('a', Point(1, 1.))})
+    serde_and_compare(obj)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason='slots=True requires python 3.10')
+def test_slots_dataclass():
+    @dataclasses.dataclass(frozen=True, slots=True)
+    class Slotted:
+        value: int
+        point: Optional[Point] = None
+
+    obj = Slotted(1, Point(1, 2.))
+    assert not hasattr(obj, '__dict__')
+    serde_and_compare(obj, true_payload={'value': 1, 'point': [1, 2., None]})
+
+
+def test_camel_case_dataclass():
+    serde_and_compare(CamelData('a'), true_payload={'fieldName': 'a'})
+
+
+@pytest.mark.parametrize('obj', [
+    Polygon([Point(0, 0.), Point(1, 1., 'b')]),
+    Frozen(1, {'a': Item('a', Point(1, 1.))}),
+])
+def test_iterative(obj):
+    payload = serialize(obj)
+    assert iterative.serialize(obj) == payload
+    assert iterative.deserialize(payload, type(obj)) == deserialize(payload, type(obj))
@@ -1,7 +1,16 @@
+import gc
 import io
+import os
+import threading
 
+import pytest
+
+from pyjackson import helpers
 from pyjackson.core import Comparable
-from pyjackson.helpers import dump, dumps, load, loads, read, write
+from pyjackson.errors import DeserializationError
+from pyjackson.helpers import (ShardManifest, bulk_load, cached_read, clear_read_cache, detect_compression, dump,
+                               dump_lines, dumps, load, load_lines, loads, ndjson_offsets, read, read_dir, read_lines,
+                               read_sharded, write, write_lines, write_sharded)
 
 
 class Payload(Comparable):
@@ -44,3 +53,274 @@ def test_dump():
     buffer = io.StringIO()
     dump(buffer, OBJ_PAYLOAD)
     assert STR_PAYLOAD == buffer.getvalue()
+
+
+LINES = [Payload('a'), Payload('б'), Payload('c' * 100)]
+
+
+def test_lines():
+    buffer = io.StringIO()
+    assert dump_lines(buffer, LINES) == len(buffer.getvalue())
+    assert buffer.getvalue().count('\n') == 3
+    buffer.seek(0)
+    assert list(load_lines(buffer, Payload)) == LINES
+
+
+def test_read_lines(tmp_file):
+    write_lines(tmp_file, LINES)
+    assert list(read_lines(tmp_file, Payload)) == LINES
+
+    offsets = ndjson_offsets(tmp_file)
+    assert offsets == [0, 15, 35]
+    assert list(read_lines(tmp_file, Payload, offsets[::-2])) == LINES[::-2]
+
+
+def test_read_lines_blank_and_unterminated(tmp_file):
+    with open(tmp_file, 'w') as f:
+        f.write('\n  {"field": "a"}\r\n \n\n{"field": "b"}')
+    assert ndjson_offsets(tmp_file) == [1, 22]
+    assert list(read_lines(tmp_file, Payload)) == [Payload('a'), Payload('b')]
+
+
+def test_read_lines_empty(tmp_file):
+    write_lines(tmp_file, [])
+    assert ndjson_offsets(tmp_file) == []
+    assert list(read_lines(tmp_file, Payload)) == []
+
+
+@pytest.mark.parametrize('ext,compression', [
+    ('.gz', 'gzip'), ('.bz2', 'bz2'), ('.xz', 'xz'), ('.zst', 'zstd'), ('.json', None)
+])
+def test_compressed(tmpdir, ext, compression):
+    if compression == 'zstd':
+        pytest.importorskip('zstandard')
+    path = os.path.join(tmpdir, 'file' + ext)
+    write(path, OBJ_PAYLOAD)
+    assert detect_compression(path) == compression
+    assert read(path, Payload) == OBJ_PAYLOAD
+
+    write_lines(path, LINES * 1000)
+    assert detect_compression(path) == compression
+    assert list(read_lines(path, Payload)) == LINES * 1000
+
+
+def test_compression_detected_by_magic(tmpdir):
+    path = os.path.join(tmpdir, 'file.gz')
+    write(path, OBJ_PAYLOAD)
+    renamed = os.path.join(tmpdir, 'file.json')
+    os.rename(path, renamed)
+    assert read(renamed, Payload) == OBJ_PAYLOAD
+
+
+def _write_fifo(path: str, data: bytes) -> threading.Thread:
+    def write_data():
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    thread = threading.Thread(target=write_data)
+    thread.start()
+    return thread
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason='fifo is not supported')
+@pytest.mark.parametrize('ext', ['.gz', '.json'])
+def test_read_pipe(tmpdir, ext):
+    # magic bytes must not be consumed from stream which can be read only once
+    path = os.path.join(tmpdir, 'file' + ext)
+    fifo = os.path.join(tmpdir, 'fifo')
+    os.mkfifo(fifo)
+
+    write(path, OBJ_PAYLOAD)
+    with open(path, 'rb') as f:
+        thread = _write_fifo(fifo, f.read())
+    assert read(fifo, Payload) == OBJ_PAYLOAD
+    thread.join()
+
+    write_lines(path, LINES)
+    with open(path, 'rb') as f:
+        thread = _write_fifo(fifo, f.read())
+    assert list(read_lines(fifo, Payload)) == LINES
+    thread.join()
+
+
+def test_compressed_offsets(tmpdir):
+    path = os.path.join(tmpdir, 'file.gz')
+    write_lines(path, LINES)
+    with pytest.raises(ValueError):
+        ndjson_offsets(path)
+    with pytest.raises(ValueError):
+        list(read_lines(path, Payload, [0]))
+
+
+@pytest.fixture
+def read_cache():
+    clear_read_cache()
+    yield
+    clear_read_cache()
+
+
+def test_cached_read(tmp_file, read_cache):
+    write(tmp_file, OBJ_PAYLOAD)
+    obj = cached_read(tmp_file, Payload)
+    assert obj == OBJ_PAYLOAD
+    assert cached_read(tmp_file, Payload) is obj
+
+    write(tmp_file, Payload('new value'))
+    assert cached_read(tmp_file, Payload) == Payload('new value')
+
+
+def test_cached_read_same_size(tmp_file, read_cache):
+    write(tmp_file, Payload('a'))
+    os.utime(tmp_file, ns=(1, 1))
+    assert cached_read(tmp_file, Payload) == Payload('a')
+    write(tmp_file, Payload('b'))
+    os.utime(tmp_file, ns=(2, 2))
+    assert cached_read(tmp_file, Payload) == Payload('b')
+
+
+def test_cached_read_stat_interval(tmp_file, read_cache):
+    write(tmp_file, OBJ_PAYLOAD)
+    obj = cached_read(tmp_file, Payload, stat_interval=60)
+    os.remove(tmp_file)
+    assert cached_read(tmp_file, Payload, stat_interval=60) is obj
+    with pytest.raises(FileNotFoundError):
+        cached_read(tmp_file, Payload)
+
+
+def test_cached_read_lru(tmpdir, read_cache, monkeypatch):
+    monkeypatch.setattr(helpers, 'READ_CACHE_SIZE', 2)
+    paths = [os.path.join(tmpdir, '{}.json'.format(i)) for i in range(3)]
+    for path in paths:
+        write(path, OBJ_PAYLOAD)
+    first = cached_read(paths[0], Payload)
+    cached_read(paths[1], Payload)
+    assert cached_read(paths[0], Payload) is first
+    cached_read(paths[2], Payload)  # evicts paths[1]
+    assert cached_read(paths[0], Payload) is first
+    assert list(helpers._read_cache) == [(paths[2], Payload), (paths[0], Payload)]
+
+
+@pytest.fixture
+def json_dir(tmpdir):
+    for i in range(20):
+        write(os.path.join(tmpdir, '{:02}.json'.format(i)), Payload(str(i)))
+    write(os.path.join(tmpdir, 'compressed.json.gz'), Payload('gz'))
+    os.mkdir(os.path.join(tmpdir, 'dir.json'))
+    return str(tmpdir)
+
+
+@pytest.mark.parametrize('processes', [None, 2])
+def test_read_dir(json_dir, processes):
+    result = list(read_dir(json_dir, Payload, workers=4, processes=processes, ordered=True))
+    assert [os.path.basename(p) for p, _ in result] == ['{:02}.json'.format(i) for i in range(20)]
+    assert [o for _, o in result] == [Payload(str(i)) for i in range(20)]
+
+    result = dict(read_dir(json_dir, Payload, pattern='*.json*', workers=3, processes=processes))
+    assert len(result) == 21
+    assert result[os.path.join(json_dir, 'compressed.json.gz')] == Payload('gz')
+
+
+def test_read_dir_error(json_dir):
+    with open(os.path.join(json_dir, '05.json'), 'w') as f:
+        f.write('{}')
+    with pytest.raises(ValueError):
+        list(read_dir(json_dir, Payload, workers=2, ordered=True))
+
+
+SHARDED = [Payload(str(i)) for i in range(103)]
+
+
+@pytest.mark.parametrize('shards,batch_size,processes,extension', [
+    (4, 10, None, '.ndjson'),
+    (3, 1, None, '.ndjson.gz'),
+    (2, 1000, 2, '.ndjson'),
+])
+def test_sharded(tmpdir, shards, batch_size, processes, extension):
+    directory = os.path.join(tmpdir, 'sharded')
+    manifest = write_sharded(directory, iter(SHARDED), Payload, shards, batch_size, processes, extension)
+    assert len(manifest.shards) == shards
+    assert sum(manifest.counts) == len(SHARDED)
+    assert read(os.path.join(directory, 'manifest.json'), ShardManifest) == manifest
+
+    assert list(read_sharded(directory, Payload, processes=processes)) == SHARDED
+    unordered = list(read_sharded(directory, Payload, ordered=False))
+    assert sorted(unordered, key=lambda p: int(p.field)) == SHARDED
+
+
+def test_sharded_empty(tmpdir):
+    write_sharded(tmpdir, [], Payload, shards=2)
+    assert list(read_sharded(tmpdir, Payload)) == []
+
+
+def test_sharded_streams_input(tmpdir, monkeypatch):
+    produced, dumped, backlog = [0], [0], []
+    dump_batch = helpers._dump_batch
+
+    def counting_dump_batch(batch, as_class):
+        dumped[0] += len(batch)
+        return dump_batch(batch, as_class)
+
+    def objs():
+        for i in range(10000):
+            backlog.append(produced[0] - dumped[0])
+            produced[0] += 1
+            yield Payload(str(i))
+
+    monkeypatch.setattr(helpers, '_dump_batch', counting_dump_batch)
+    manifest = write_sharded(tmpdir, objs(), Payload, shards=2, batch_size=10)
+    assert sum(manifest.counts) == 10000
+    # at most 2 * workers batches are in flight plus the one being collected
+    assert max(backlog) <= 5 * 10
+    assert [p.field for p in read_sharded(tmpdir, Payload)] == [str(i) for i in range(10000)]
+
+
+def test_sharded_corrupted(tmpdir):
+    manifest = write_sharded(tmpdir, SHARDED, Payload, shards=2)
+    write_lines(os.path.join(tmpdir, manifest.shards[1]), SHARDED[:3])
+    with pytest.raises(DeserializationError):
+        list(read_sharded(tmpdir, Payload))
+
+
+def test_bulk_load():
+    assert gc.isenabled()
+    with bulk_load():
+        assert not gc.isenabled()
+        with bulk_load():
+            assert not gc.isenabled()
+        assert not gc.isenabled()
+    assert gc.isenabled()
+
+
+def test_bulk_load_gc_disabled():
+    gc.disable()
+    try:
+        with bulk_load():
+            pass
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+
+
+def test_bulk_load_error():
+    with pytest.raises(ValueError):
+        with bulk_load():
+            raise ValueError()
+    assert gc.isenabled()
+
+
+@pytest.mark.skipif(not hasattr(gc, 'freeze'), reason='gc.freeze is python 3.7+')
+def test_bulk_load_freeze():
+    try:
+        with bulk_load(freeze=True):
+            obj = loads(STR_PAYLOAD, Payload)
+        assert gc.get_freeze_count() > 0
+        assert obj == OBJ_PAYLOAD
+    finally:
+        gc.unfreeze()
+
+
+def test_loads_bulk(tmp_file):
+    assert loads(STR_PAYLOAD, Payload, bulk=True) == OBJ_PAYLOAD
+    write(tmp_file, OBJ_PAYLOAD)
+    assert read(tmp_file, Payload, bulk=True) == OBJ_PAYLOAD
+    assert gc.isenabled()
@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import pyjackson
+from pyjackson.spec_cache import SPEC_CACHE_ENV
+
+HEAVY_MODULES = {'concurrent.futures.process', 'multiprocessing', 'pickle', 'pyjackson.helpers'}
+
+
+def _run(statement: str, *options: str) -> subprocess.CompletedProcess:
+    src = os.path.dirname(os.path.dirname(pyjackson.__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([src, os.environ.get('PYTHONPATH', '')]))
+    env.pop(SPEC_CACHE_ENV, None)
+    return subprocess.run([sys.executable, '-W', 'ignore', *options, '-c', statement], env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+
+def _imported_modules(statement: str) -> set:
+    output = _run(statement + '; import sys; print(" ".join(sys.modules))').stdout
+    return set(output.split())
+
+
+def _pyjackson_modules(statement: str) -> set:
+    # _typing_utils implementation depends on python version
+    return {m for m in _imported_modules(statement)
+            if m.startswith('pyjackson') and not m.startswith('pyjackson._typing_utils')}
+
+
+ENTRY_POINT_MODULES = {'pyjackson', 'pyjackson.core', 'pyjackson.errors', 'pyjackson.generics', 'pyjackson.utils',
+                       'pyjackson.spec_cache', 'pyjackson.serialization', 'pyjackson.deserialization'}
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='module __getattr__ is python 3.7+')
+@pytest.mark.parametrize('statement,modules', [
+    ('import pyjackson', {'pyjackson'}),
+    ('from pyjackson import serialize, deserialize', ENTRY_POINT_MODULES),
+    ('import pyjackson; pyjackson.serialize, pyjackson.deserialize', ENTRY_POINT_MODULES),
+    # default serializers are imported on first lookup
+    ('from pyjackson import serialize; serialize(1)', ENTRY_POINT_MODULES | {'pyjackson.builtin_types'}),
+    ('from pyjackson import read, write',
+     ENTRY_POINT_MODULES | {'pyjackson.builtin_types', 'pyjackson.helpers', 'pyjackson._msgpack'}),
+])
+def test_imported_modules(statement, modules):
+    assert _pyjackson_modules(statement) == modules
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='module __getattr__ is python 3.7+')
+@pytest.mark.parametrize('statement,not_imported', [
+    ('import pyjackson', {'pyjackson.builtin_types', 'pyjackson.utils', 'inspect'}),
+    ('from pyjackson import serialize', set()),
+    ('from pyjackson.decorators import type_field', {'pyjackson.builtin_types', 'pyjackson.serialization'}),
+])
+def test_lazy_imports(statement, not_imported):
+    modules = _imported_modules(statement)
+    assert not modules & (HEAVY_MODULES | not_imported)
+
+
+@pytest.mark.parametrize('name', ['core', 'errors', 'generics', 'utils', 'serialization', 'deserialization',
+                                  'decorators', 'helpers', 'builtin_types', 'spec_cache', 'warmup', 'compile'])
+def test_submodule_attributes(name):
+    module = _run('import pyjackson; print(pyjackson.{}.__name__)'.format(name)).stdout.strip()
+    assert module == 'pyjackson.' + name
+
+
+USER_SERIALIZER = """
+import datetime
+from pyjackson.generics import StaticSerializer
+
+class CustomDatetimeSerializer(StaticSerializer):
+    real_type = datetime.datetime
+
+    @classmethod
+    def serialize(cls, instance):
+        return 'custom'
+
+    @classmethod
+    def deserialize(cls, obj):
+        return datetime.datetime(2000, 1, 1)
+
+from pyjackson import deserialize, serialize
+print(serialize(datetime.datetime(2020, 1, 1)), deserialize('', datetime.datetime).year)
+"""
+
+
+@pytest.mark.parametrize('statement', [
+    'import pyjackson.utils as utils',
+    'import pyjackson.generics; import pyjackson.utils as utils',
+    'from pyjackson.decorators import type_field; from pyjackson import utils',
+])
+def test_builtins_registered_on_lookup(statement):
+    output = _run(statement + '; import datetime, enum; '
+                  'print(utils.has_serializer(datetime.datetime), utils.has_serializer(enum.Enum("E", "A")))').stdout
+    assert output.split() == ['True', 'True']
+
+
+def test_user_serializer_registered_before_builtins():
+    # builtin types are registered on first lookup, after user serializer, and do not replace it
+    assert _run(USER_SERIALIZER).stdout.split() == ['custom', '2000']
+
+
+def test_lazy_attributes():
+    assert set(dir(pyjackson)) >= set(pyjackson.__all__)
+    assert pyjackson.serialize is pyjackson.serialization.serialize
+    assert pyjackson.builtin_types.__name__ == 'pyjackson.builtin_types'
+    with pytest.raises(AttributeError):
+        pyjackson.no_such_attribute
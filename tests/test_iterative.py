@@ -0,0 +1,180 @@
+import sys
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+import pytest
+
+import pyjackson
+from pyjackson import iterative
+from pyjackson.decorators import make_string, rename_fields, type_field
+from pyjackson.errors import DeserializationError, SerializationError, UnserializableError
+from pyjackson.utils import Comparable
+from tests.test_aslist import ChildAL, SimpleAL
+from tests.test_pyjackson import (Child, Foo, HintAndDefault, HintAndDefaultDict, OptionalNone, Parent, SecondChild,
+                                  SetTest, TupleTest, WithHierarchyAsField)
+from tests.test_serializer import BClass, BContainer, BSerializer, CClass, ContainerSized, SizedTestType
+
+
+@make_string
+class Node(Comparable):
+    def __init__(self, value: int, next: Optional['Node'] = None):
+        self.value = value
+        self.next = next
+
+
+@rename_fields(value='val')
+class Renamed(Comparable):
+    def __init__(self, value: str, children: List['Renamed'] = None):
+        self.value = value
+        self.children = children
+
+
+@type_field('kind')
+class Shape(Comparable):
+    kind = None
+
+
+class Box(Shape):
+    kind = 'box'
+
+    def __init__(self, size: Tuple[int, int]):
+        self.size = size
+
+
+class Unions(Comparable):
+    def __init__(self, value: Union[int, Box, List[Box]]):
+        self.value = value
+
+
+class Wrapper(Comparable):
+    def __init__(self, node: Node):
+        self.node = node
+
+
+def _linked_list(size):
+    node = None
+    for i in reversed(range(size)):
+        node = Node(i, node)
+    return node
+
+
+CASES = [
+    (Node(1, Node(2)), None),
+    (HintAndDefault(), None),
+    (HintAndDefaultDict({'a': Foo('b')}), None),
+    (OptionalNone([1, None]), None),
+    (TupleTest((1, 2, 3)), None),
+    (SetTest({1, 2}), None),
+    (Child(), Parent),
+    (SecondChild('a'), Child),
+    (WithHierarchyAsField(SecondChild('b')), None),
+    (SimpleAL(1, 'a'), None),
+    (ChildAL('b'), None),
+    (BContainer(BClass('a')), None),
+    (BClass('a'), BSerializer()),
+    (ContainerSized(CClass([5] * 10)), None),
+    (Renamed('a', [Renamed('b'), Renamed('c', [])]), None),
+    (Unions(1), None),
+    (Unions(Box((1, 2))), None),
+    (Unions([Box((1, 2)), Box((3, 4))]), None),
+    ([Node(1), Node(2)], List[Node]),
+    ({'a': Node(1)}, Dict[str, Node]),
+    ({1: 2}, Dict[int, int]),
+    ((1, 'a'), Tuple[int, str]),
+    ({'a', 'b'}, Set[str]),
+    ({'a': [1, {'b'}]}, Any),
+    ([1, None, 'a'], None),
+    (Node(1), Union[int, Node]),
+]
+
+
+@pytest.mark.parametrize('obj,as_class', CASES)
+def test_same_as_recursive(obj, as_class):
+    payload = pyjackson.serialize(obj, as_class)
+    assert iterative.serialize(obj, as_class) == payload
+
+    as_class = as_class or type(obj)
+    expected = pyjackson.deserialize(payload, as_class)
+    actual = iterative.deserialize(payload, as_class)
+    assert type(actual) is type(expected)
+    assert actual == expected
+
+
+def test_deep_linked_list():
+    size = sys.getrecursionlimit() * 2
+    obj = _linked_list(size)
+
+    with pytest.raises(RecursionError):
+        pyjackson.serialize(obj)
+
+    payload = iterative.serialize(obj)
+    depth = 0
+    node = payload
+    while node is not None:
+        depth += 1
+        node = node.get('next')
+    assert depth == size
+
+    new_obj = iterative.deserialize(payload, Node)
+    for i in range(size):
+        assert new_obj.value == i
+        new_obj = new_obj.next
+    assert new_obj is None
+
+
+def test_deep_nested_lists():
+    size = sys.getrecursionlimit() * 2
+    obj = []
+    for _ in range(size):
+        obj = [{'a': obj}]
+
+    with pytest.raises(RecursionError):
+        pyjackson.serialize(obj)
+
+    payload = iterative.serialize(obj)
+    for _ in range(size):
+        assert isinstance(payload, list) and len(payload) == 1
+        payload = payload[0]['a']
+    assert payload == []
+
+
+@pytest.mark.parametrize('payload,as_class', [
+    ([{'value': 1}, 3], List[Union[Node, int]]),
+    ({'node': {'value': 1, 'next': {'value': 2}}}, Union[Wrapper, str]),
+    ({'node': 5}, Union[Wrapper, dict]),
+    ({'node': {'value': 1, 'next': 5}}, Union[Wrapper, Node, dict]),
+])
+def test_union_backtracking(payload, as_class):
+    assert iterative.deserialize(payload, as_class) == pyjackson.deserialize(payload, as_class)
+
+
+def test_errors():
+    class A(pyjackson.core.Unserializable):
+        pass
+
+    with pytest.raises(UnserializableError):
+        iterative.serialize([A()])
+
+    with pytest.raises(DeserializationError):
+        iterative.deserialize({'a': 1}, Dict[Tuple[int, int], int])
+
+    with pytest.raises(ValueError):
+        iterative.deserialize({}, Node)
+
+    with pytest.raises(DeserializationError):
+        iterative.deserialize({'kind': 'unknown'}, Shape)
+
+    with pytest.raises(DeserializationError):
+        iterative.deserialize(5, Union[Wrapper, Node])
+
+    with pytest.raises(SerializationError):
+        iterative.serialize(Node, Union[type, SizedTestType])
+
+
+@pytest.mark.parametrize('payload,as_class', [
+    ([{'value': i} for i in range(1000)], List[Node]),
+    ({str(i): {'value': i} for i in range(1000)}, Dict[int, Node]),
+    (list(range(1000)), Tuple[int, ...]),
+    ([{'value': i} for i in range(1000)] + [5], Union[List[Node], List[Union[Node, int]]]),
+])
+def test_big_collections(payload, as_class):
+    assert iterative.deserialize(payload, as_class) == pyjackson.deserialize(payload, as_class)
@@ -0,0 +1,84 @@
+import array
+import datetime
+from typing import Dict, List, Optional
+
+import pytest
+
+from pyjackson import _msgpack, dumpb_msgpack, helpers, loadb_msgpack, serialize
+from pyjackson.builtin_types import ArraySerializer
+from pyjackson.errors import DeserializationError, SerializationError
+from pyjackson.utils import Comparable
+
+PackedDoubles = ArraySerializer('d', packed=True)
+
+
+class Blob(Comparable):
+    def __init__(self, name: str, data: bytes, view: memoryview = None, values: PackedDoubles = None,
+                 created: datetime.datetime = None, meta: Dict[int, List[Optional[float]]] = None):
+        self.name = name
+        self.data = data
+        self.view = view
+        self.values = values
+        self.created = created
+        self.meta = meta
+
+
+BLOB = Blob('a', b'\x00\x01', memoryview(b'abc'), array.array('d', [1., 2.]), datetime.datetime(2020, 1, 1),
+            {1: [0.5, None], -2: []})
+
+VALUES = [
+    None, True, False, 0, 1, 127, 128, 255, 256, 65535, 65536, 2 ** 32, 2 ** 64 - 1,
+    -1, -32, -33, -128, -129, -2 ** 15 - 1, -2 ** 31 - 1, -2 ** 63,
+    0.5, -1e100, '', 'a', 'я' * 31, 'b' * 32, 'c' * 256, 'd' * 65536,
+    b'', b'\xff' * 256, b'x' * 65536, [], [1] * 16, [None] * 65536, {}, {'a': 1}, {i: i for i in range(16)},
+    {'a': [{'b': b'c', 'd': [1.5, None]}]},
+]
+
+
+@pytest.fixture(params=['msgpack', 'pure'])
+def backend(request, monkeypatch):
+    if request.param == 'msgpack':
+        pytest.importorskip('msgpack')
+    else:
+        monkeypatch.setattr(helpers, 'msgpack', None)
+    return request.param
+
+
+def test_dumpb_loadb(backend):
+    payload = dumpb_msgpack(BLOB)
+    assert isinstance(payload, bytes)
+    assert b'\x00\x01' in payload  # stored as is, not in base64
+    new_blob = loadb_msgpack(payload, Blob)
+    assert new_blob == BLOB
+    assert isinstance(new_blob.view, memoryview)
+    assert isinstance(new_blob.values, array.array)
+
+
+def test_binary_payloads_are_scoped(backend):
+    dumpb_msgpack(BLOB)
+    assert serialize(b'\x00\x01') == 'AAE='
+
+
+@pytest.mark.parametrize('value', VALUES)
+def test_pure_msgpack(value):
+    assert _msgpack.unpackb(_msgpack.packb(value)) == value
+
+
+@pytest.mark.parametrize('value', VALUES)
+def test_pure_msgpack_compatibility(value):
+    msgpack = pytest.importorskip('msgpack')
+    assert _msgpack.packb(value) == msgpack.packb(value, use_bin_type=True)
+    assert _msgpack.unpackb(msgpack.packb(value, use_bin_type=True)) == value
+
+
+def test_pure_msgpack_errors():
+    with pytest.raises(SerializationError):
+        _msgpack.packb(2 ** 64)
+    with pytest.raises(SerializationError):
+        _msgpack.packb(object())
+    with pytest.raises(DeserializationError):
+        _msgpack.unpackb(b'\x92\x01')
+    with pytest.raises(DeserializationError):
+        _msgpack.unpackb(b'\x01\x01')
+    with pytest.raises(DeserializationError):
+        _msgpack.unpackb(b'\xc1')
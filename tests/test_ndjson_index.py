@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from pyjackson import write_lines
+from pyjackson.errors import DeserializationError
+from pyjackson.ndjson_index import NdjsonIndex, index_path_for
+from pyjackson.utils import Comparable
+
+
+class Record(Comparable):
+    def __init__(self, id: int, name: str):
+        self.id = id
+        self.name = name
+
+
+RECORDS = [Record(i * 10, 'record {}'.format(i) * i) for i in range(20)]
+
+
+@pytest.fixture
+def data_file(tmp_file):
+    write_lines(tmp_file, RECORDS)
+    return tmp_file
+
+
+def test_build(data_file):
+    with NdjsonIndex.build(data_file) as index:
+        assert len(index) == len(RECORDS)
+        assert index.keys is None
+        for i in [0, 5, 19, -1]:
+            assert index.read(i, Record) == RECORDS[i]
+
+
+def test_save_load(data_file):
+    index = NdjsonIndex.build(data_file, key='id')
+    index.save()
+    assert os.path.exists(index_path_for(data_file))
+
+    with NdjsonIndex.load(data_file) as loaded:
+        assert list(loaded.offsets) == list(index.offsets)
+        assert loaded.keys == {r.id: i for i, r in enumerate(RECORDS)}
+        assert loaded.read_key(130, Record) == RECORDS[13]
+        with pytest.raises(KeyError):
+            loaded.read_key(131, Record)
+
+
+def test_open_rebuilds_outdated(data_file):
+    NdjsonIndex.open(data_file).close()
+    write_lines(data_file, RECORDS[:3])
+    os.utime(data_file, ns=(1, 1))
+
+    with pytest.raises(DeserializationError):
+        NdjsonIndex.load(data_file)
+
+    with NdjsonIndex.open(data_file, key='name') as index:
+        assert len(index) == 3
+        assert index.read_key('record 2record 2', Record) == RECORDS[2]
+    with NdjsonIndex.load(data_file) as index:
+        assert index.key == 'name'
+
+
+def test_load_corrupted(data_file):
+    with open(index_path_for(data_file), 'wb') as f:
+        f.write(b'garbage')
+    with pytest.raises(DeserializationError):
+        NdjsonIndex.load(data_file)
+    with NdjsonIndex.open(data_file) as index:
+        assert index.read(1, Record) == RECORDS[1]
+
+
+def test_no_key_map(data_file):
+    with NdjsonIndex.open(data_file) as index, pytest.raises(ValueError):
+        index.read_key(0, Record)
+
+
+@pytest.mark.parametrize('lines,message', [
+    (['{"id": 1}', '{"name": "a"}'], 'has no key field'),
+    (['{"id": 1}', '[1, 2]'], 'has no key field'),
+    (['{"id": [1]}'], 'not hashable'),
+    (['{"id": 1}', '{"id": 2}', '{"id": 1}'], 'Records 0 and 2'),
+])
+def test_build_bad_keys(tmp_file, lines, message):
+    with open(tmp_file, 'w') as f:
+        f.write('\n'.join(lines))
+    with pytest.raises(DeserializationError, match=message):
+        NdjsonIndex.build(tmp_file, key='id')
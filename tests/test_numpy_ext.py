@@ -0,0 +1,70 @@
+import pytest
+
+from pyjackson import deserialize, serialize
+from pyjackson.errors import SerializationError
+from pyjackson.utils import Comparable
+
+numpy = pytest.importorskip('numpy')
+numpy_ext = pytest.importorskip('pyjackson.numpy_ext')
+
+
+class Features(Comparable):
+    def __init__(self, name: str, vector: numpy.ndarray):
+        self.name = name
+        self.vector = vector
+
+    def __eq__(self, other):
+        return self.name == other.name and numpy.array_equal(self.vector, other.vector) and \
+            self.vector.dtype == other.vector.dtype
+
+
+ARRAYS = [
+    numpy.arange(12, dtype='f4').reshape(3, 4),
+    numpy.arange(12, dtype='f4').reshape(3, 4).T,
+    numpy.arange(3, dtype='>i4'),
+    numpy.zeros((0, 3), dtype='i8'),
+    numpy.array(5.),
+    numpy.array([True, False]),
+]
+
+
+def _assert_same(arr, new_arr):
+    assert new_arr.dtype == arr.dtype
+    assert new_arr.shape == arr.shape
+    assert numpy.array_equal(new_arr, arr)
+
+
+@pytest.mark.parametrize('arr', ARRAYS)
+def test_ndarray(arr):
+    payload = serialize(arr)
+    assert isinstance(payload['data'], str)
+    _assert_same(arr, deserialize(payload, numpy.ndarray))
+
+
+def test_ndarray_payload():
+    payload = serialize(numpy.array([1, 2], dtype='<u2'))
+    assert payload == {'dtype': '<u2', 'shape': [2], 'data': 'AQACAA=='}
+
+
+def test_ndarray_no_copy():
+    new_arr = deserialize(serialize(numpy.arange(10)), numpy.ndarray)
+    assert not new_arr.flags.owndata
+    assert not new_arr.flags.writeable
+
+
+@pytest.mark.parametrize('arr', ARRAYS + [numpy.array([1, 'a'], dtype=object)])
+def test_ndarray_list(arr):
+    payload = serialize(arr, numpy_ext.NumpyNdarrayListSerializer)
+    assert payload['data'] == arr.tolist()
+    _assert_same(arr, deserialize(payload, numpy_ext.NumpyNdarrayListSerializer))
+    _assert_same(arr, deserialize(payload, numpy.ndarray))
+
+
+def test_ndarray_structured():
+    with pytest.raises(SerializationError):
+        serialize(numpy.zeros(2, dtype=[('a', 'i4')]))
+
+
+def test_ndarray_field():
+    obj = Features('a', numpy.random.rand(10))
+    assert deserialize(serialize(obj), Features) == obj
@@ -0,0 +1,92 @@
+import dataclasses
+import struct
+from typing import List, NamedTuple
+
+import pytest
+
+from pyjackson import deserialize, serialize
+from pyjackson.errors import DeserializationError, SerializationError
+from pyjackson.packing import FixedString, get_struct_layout, iter_unpack, pack, pack_many, unpack
+from pyjackson.utils import Comparable
+
+Name = FixedString(8)
+
+
+class Metric(Comparable):
+    def __init__(self, name: Name, value: float, count: int, valid: bool = True):
+        self.name = name
+        self.value = value
+        self.count = count
+        self.valid = valid
+
+
+@dataclasses.dataclass
+class Point:
+    x: float
+    y: float
+
+
+class Pair(NamedTuple):
+    left: int
+    right: int
+
+
+class NotFlat(Comparable):
+    def __init__(self, values: List[int]):
+        self.values = values
+
+
+def test_layout():
+    layout = get_struct_layout(Metric)
+    assert layout.struct.format == '<8sdq?'
+    assert layout.size == 25
+    assert get_struct_layout(Metric) is layout
+
+
+@pytest.mark.parametrize('obj', [
+    Metric('cpu', 0.5, 10),
+    Metric('мем', -1e100, -2 ** 63, False),
+    Metric('', 0., 0),
+    Point(1., 2.5),
+    Pair(1, 2),
+])
+def test_pack_unpack(obj):
+    payload = pack(obj)
+    assert len(payload) == get_struct_layout(type(obj)).size
+    assert unpack(payload, type(obj)) == obj
+
+
+def test_pack_payload():
+    assert pack(Pair(1, -1)) == struct.pack('<qq', 1, -1)
+    assert pack(Metric('ab', 1., 2)) == b'ab' + b'\0' * 6 + struct.pack('<dq?', 1., 2, True)
+
+
+def test_pack_many():
+    objs = [Metric('m{}'.format(i), i / 2, i, i % 2 == 0) for i in range(10)]
+    payload = pack_many(objs, Metric)
+    assert len(payload) == 10 * get_struct_layout(Metric).size
+    assert list(iter_unpack(payload, Metric)) == objs
+    assert list(iter_unpack(memoryview(payload)[25:50], Metric)) == objs[1:2]
+    assert list(iter_unpack(b'', Metric)) == []
+
+
+def test_fixed_string_json():
+    obj = Metric('cpu', 0.5, 10)
+    assert deserialize(serialize(obj), Metric) == obj
+    with pytest.raises(SerializationError):
+        serialize(Metric('too long name', 0.5, 10))
+
+
+def test_errors():
+    with pytest.raises(SerializationError):
+        pack(NotFlat([1]))
+    with pytest.raises(SerializationError):
+        pack(Metric('too long name', 0.5, 10))
+    with pytest.raises(SerializationError):
+        pack(Pair(2 ** 63, 0))
+    with pytest.raises(SerializationError):
+        pack_many([Pair(1, 2), Point(1., 2.)], Pair)
+    with pytest.raises(DeserializationError):
+        unpack(b'\0' * 15, Pair)
+    with pytest.raises(DeserializationError):
+        iter_unpack(b'\0' * 17, Pair)
@@ -0,0 +1,64 @@
+from typing import List
+
+from pyjackson import iterative, serialize
+from pyjackson.decorators import as_list
+from pyjackson.utils import Comparable, get_class_fields_getter, is_serializable
+from tests.conftest import serde_and_compare
+
+
+class Slotted(Comparable):
+    __slots__ = ('a', 'b', 'c')
+
+    def __init__(self, a: int, b: str, c: List['Slotted'] = None):
+        self.a = a
+        self.b = b
+        self.c = c
+
+
+@as_list
+class SlottedAsList(Comparable):
+    __slots__ = ('a', 'b')
+
+    def __init__(self, a: int, b: str = None):
+        self.a = a
+        self.b = b
+
+
+class SingleField(Comparable):
+    __slots__ = ('a',)
+
+    def __init__(self, a: int):
+        self.a = a
+
+
+class NoFields(Comparable):
+    __slots__ = ()
+
+
+def test_fields_getter():
+    assert get_class_fields_getter(Slotted)(Slotted(1, 'a')) == (1, 'a', None)
+    assert get_class_fields_getter(SingleField)(SingleField(1)) == (1,)
+    assert get_class_fields_getter(NoFields)(NoFields()) == ()
+
+
+def test_slotted():
+    obj = Slotted(1, 'a', [Slotted(2, 'b')])
+    assert not hasattr(obj, '__dict__')
+    serde_and_compare(obj, true_payload={'a': 1, 'b': 'a', 'c': [{'a': 2, 'b': 'b'}]})
+    assert iterative.serialize(obj) == serialize(obj)
+
+
+def test_slotted_as_list():
+    serde_and_compare(SlottedAsList(1, 'a'), true_payload=[1, 'a'])
+    serde_and_compare(SlottedAsList(1), true_payload=[1])
+
+
+def test_single_field():
+    serde_and_compare(SingleField(1), true_payload={'a': 1})
+    serde_and_compare(NoFields(), true_payload={})
+
+
+def test_unset_slot_is_not_serializable():
+    obj = Slotted.__new__(Slotted)
+    obj.a = 1
+    assert not is_serializable(obj)
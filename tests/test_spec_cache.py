@@ -0,0 +1,132 @@
+import importlib.util
+import os
+import sys
+from typing import Dict, List, Optional
+
+import pytest
+
+from pyjackson import disable_spec_cache, enable_spec_cache, save_spec_cache, spec_cache, utils
+from pyjackson.builtin_types import ColumnarSerializer
+from pyjackson.core import CLASS_SPECS_CACHE
+from pyjackson.utils import Comparable, get_class_fields
+
+
+class Item(Comparable):
+    def __init__(self, name: str, count: int = 1):
+        self.name = name
+        self.count = count
+
+
+class Order(Comparable):
+    def __init__(self, items: List[Item], meta: Optional[Dict[str, float]] = None, parent: Optional['Order'] = None):
+        self.items = items
+        self.meta = meta
+        self.parent = parent
+
+
+class MutableDefault:
+    def __init__(self, items: List[int] = []):
+        self.items = items
+
+
+class WithSerializer:
+    def __init__(self, items: ColumnarSerializer(Item)):
+        self.items = items
+
+
+CACHED = [Item, Order]
+NOT_CACHED = [MutableDefault, WithSerializer]
+
+
+def _forget(*classes):
+    for cls in classes:
+        CLASS_SPECS_CACHE.pop(cls, None)
+
+
+@pytest.fixture
+def cache_path(tmpdir):
+    path = os.path.join(tmpdir, 'cache', 'specs')
+    enable_spec_cache(path)
+    _forget(*CACHED, *NOT_CACHED)
+    yield path
+    disable_spec_cache()
+    _forget(*CACHED, *NOT_CACHED)
+
+
+def _reload(path):
+    save_spec_cache()
+    disable_spec_cache()
+    enable_spec_cache(path)
+    _forget(*CACHED, *NOT_CACHED)
+
+
+def test_spec_cache(cache_path, monkeypatch):
+    expected = [get_class_fields(cls) for cls in CACHED + NOT_CACHED]
+    _reload(cache_path)
+
+    assert [get_class_fields(cls) for cls in NOT_CACHED] == expected[len(CACHED):]
+    monkeypatch.setattr(utils, '_introspect_class_fields', None)
+    assert [get_class_fields(cls) for cls in CACHED] == expected[:len(CACHED)]
+
+
+@pytest.mark.parametrize('module', [__name__, 'pyjackson.core'])
+def test_spec_cache_invalidation(cache_path, module):
+    # Comparable, base class of Order, is defined in pyjackson.core
+    expected = get_class_fields(Order)
+    _reload(cache_path)
+    assert spec_cache.get_cached_fields(Order) == expected
+    spec_cache._source_hashes[module] = 'changed'
+    assert spec_cache.get_cached_fields(Order) is None
+    assert get_class_fields(Order) == expected
+    assert (module, 'changed') in spec_cache._entries[(__name__, 'Order')][0]
+
+
+MODULE_SOURCE = """
+class Edited:
+    def __init__(self, value: {}):
+        self.value = value
+"""
+
+
+def _import_edited(path: str, field_type: str, stat: os.stat_result = None):
+    with open(path, 'w') as f:
+        f.write(MODULE_SOURCE.format(field_type))
+    if stat is not None:
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    spec = importlib.util.spec_from_file_location('spec_cache_edited', path)
+    module = sys.modules['spec_cache_edited'] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.Edited
+
+
+def test_spec_cache_same_size_edit(cache_path, tmpdir):
+    # same size and modification time, like in reproducible builds
+    path = os.path.join(tmpdir, 'spec_cache_edited.py')
+    try:
+        assert get_class_fields(_import_edited(path, 'int'))[0].type is int
+        _reload(cache_path)
+        edited = _import_edited(path, 'str', os.stat(path))
+        assert get_class_fields(edited)[0].type is str
+    finally:
+        sys.modules.pop('spec_cache_edited', None)
+
+
+def test_spec_cache_local_class(cache_path):
+    class Local:
+        def __init__(self, value: int):
+            self.value = value
+
+    get_class_fields(Local)
+    assert spec_cache._entries == {}
+
+
+def test_spec_cache_corrupted(cache_path):
+    os.makedirs(os.path.dirname(cache_path))
+    with open(cache_path, 'wb') as f:
+        f.write(b'garbage')
+    enable_spec_cache(cache_path)
+    assert spec_cache._entries == {}
+    get_class_fields(Item)
+    save_spec_cache()
+    enable_spec_cache(cache_path)
+    assert spec_cache.get_cached_fields(Item) == get_class_fields(Item)
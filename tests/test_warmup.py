@@ -0,0 +1,150 @@
+import gc
+import os
+from enum import Enum
+from typing import Dict, List, Optional, Tuple, Union
+
+import pytest
+
+import pyjackson
+from pyjackson import utils, warmup
+from pyjackson.builtin_types import ColumnarSerializer, EnumSerializer
+from pyjackson.core import CLASS_GETTERS_CACHE, CLASS_SPECS_CACHE
+from pyjackson.decorators import type_field
+from pyjackson.errors import PyjacksonError
+from pyjackson.generics import SERIALIZER_MAPPING
+from pyjackson.utils import Comparable
+
+
+class Color(Enum):
+    RED = 'red'
+
+
+class Point(Comparable):
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+
+
+class Row(Comparable):
+    def __init__(self, name: str):
+        self.name = name
+
+
+@type_field('kind')
+class Figure(Comparable):
+    kind = None
+
+
+class Polygon(Figure):
+    kind = 'polygon'
+
+    def __init__(self, points: List[Tuple[Point, ...]], color: Color):
+        self.points = points
+        self.color = color
+
+
+class Drawing(Comparable):
+    def __init__(self, figures: Dict[str, Figure], rows: ColumnarSerializer(Row),
+                 parent: Optional['Drawing'] = None, tags: Union[int, str] = 0):
+        self.figures = figures
+        self.rows = rows
+        self.parent = parent
+        self.tags = tags
+
+
+ALL = [Drawing, Figure, Polygon, Point, Row]
+DRAWING = Drawing({'a': Polygon([(Point(1, 2),)], Color.RED)}, [Row('r')], Drawing({}, []))
+
+
+@pytest.fixture
+def cold():
+    for cache in (CLASS_SPECS_CACHE, CLASS_GETTERS_CACHE):
+        for cls in ALL:
+            cache.pop(cls, None)
+    SERIALIZER_MAPPING.pop(Color, None)
+
+
+def _is_prepared(cls):
+    return cls in CLASS_SPECS_CACHE and cls in CLASS_GETTERS_CACHE
+
+
+def test_prepare(cold):
+    prepared = pyjackson.prepare(Drawing)
+    assert all(_is_prepared(cls) for cls in ALL)
+    assert Color in SERIALIZER_MAPPING
+    assert set(ALL) <= set(prepared)
+    assert all(isinstance(tp, type) for tp in prepared)
+
+    assert pyjackson.deserialize(pyjackson.serialize(DRAWING), Drawing) == DRAWING
+
+
+def test_prepare_not_recursive(cold):
+    assert pyjackson.prepare(Drawing, recursive=False) == [Drawing]
+    assert _is_prepared(Drawing)
+    assert not any(_is_prepared(cls) for cls in ALL[1:])
+
+
+def test_prepare_background(cold):
+    thread = pyjackson.prepare(Drawing, background=True)
+    thread.join()
+    assert all(_is_prepared(cls) for cls in ALL)
+
+
+@pytest.mark.parametrize('tp', [
+    EnumSerializer(Color, by_name=True),
+    ColumnarSerializer(Row),
+    Dict[str, List[EnumSerializer(Color)]],
+])
+def test_prepare_serializer_arguments(cold, tp):
+    prepared = pyjackson.prepare(tp)
+    assert all(isinstance(t, type) for t in prepared)
+    assert all(isinstance(t, type) or utils.is_generic_or_union(t) for t in warmup._type_args(tp))
+
+
+def test_prepare_error():
+    class NoHints:
+        def __init__(self, value):
+            self.value = value
+
+    with pytest.raises(PyjacksonError):
+        pyjackson.prepare(List[NoHints])
+
+
+def _child_cache_misses() -> int:
+    """Number of cache misses during (de)serialization of DRAWING in forked process"""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        misses = -1
+        try:
+            introspect = utils._introspect_class_fields
+            introspected = []
+            utils._introspect_class_fields = lambda cls: introspected.append(cls) or introspect(cls)
+            caches = [CLASS_SPECS_CACHE, CLASS_GETTERS_CACHE, SERIALIZER_MAPPING]
+            sizes = [len(c) for c in caches]
+            pyjackson.deserialize(pyjackson.serialize(DRAWING), Drawing)
+            misses = len(introspected) + sum(len(c) - size for c, size in zip(caches, sizes))
+        finally:
+            os.write(write_fd, str(misses).encode())
+            os._exit(0)
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+    with os.fdopen(read_fd) as f:
+        return int(f.read())
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork is not supported')
+def test_child_cache_misses(cold):
+    assert _child_cache_misses() > 0
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork is not supported')
+def test_prefork_warmup(cold):
+    try:
+        pyjackson.prefork_warmup(Drawing)
+        if hasattr(gc, 'get_freeze_count'):
+            assert gc.get_freeze_count() > 0
+        assert _child_cache_misses() == 0
+    finally:
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()